@@ -1,24 +1,105 @@
 from django.contrib import admin, messages
+from django.contrib.admin.views.main import ChangeList
 import logging
 import logging
-from .models import Biodata
+from .models import Biodata, OutboxMessage, RenderJob
+from .pagination import CachedCountPaginator
+from . import html_templates
 
 
 from django.core.mail import send_mail
 from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
 from django.utils.html import format_html
 
+class BiodataChangeList(ChangeList):
+    def get_results(self, request):
+        # The list rows never show the data JSON; skip the blob there only,
+        # actions get their queryset from get_queryset() with every column
+        self.queryset = self.queryset.defer('data')
+        super().get_results(request)
+
+
 @admin.register(Biodata)
 class BiodataAdmin(admin.ModelAdmin):
     list_display = (
-        'id', 'title', 'user_name', 'user_email', 'template_choice', 'is_approved', 'created_at', 'payment_screenshot_thumb'
+        'id', 'profile_thumb', 'title', 'user_name', 'user_email', 'template_choice', 'is_approved', 'created_at', 'payment_screenshot_thumb',
+        'render_job_state'
     )
     readonly_fields = ('created_at', 'updated_at', 'payment_screenshot_preview')
     exclude = ('download_link',)
     list_filter = ('is_approved', 'template_choice')
     search_fields = ('title', 'user_name', 'user_email', 'user_phone')
 
-    actions = ['approve_biodata', 'export_to_excel']
+    actions = ['approve_biodata', 'export_to_excel', 'export_to_xlsx']
+    # Large tables: no extra unfiltered COUNT(*), and cached counts for paging
+    show_full_result_count = False
+    paginator = CachedCountPaginator
+
+    def get_queryset(self, request):
+        # Annotate the latest render job so the changelist needs no per-row queries
+        from django.db.models import OuterRef, Subquery
+        qs = super().get_queryset(request)
+        latest = RenderJob.objects.filter(biodata=OuterRef('pk')).order_by('-created_at')
+        return qs.annotate(
+            latest_job_status=Subquery(latest.values('status')[:1]),
+            latest_job_started=Subquery(latest.values('started_at')[:1]),
+            latest_job_finished=Subquery(latest.values('finished_at')[:1]),
+        )
+
+    def get_changelist(self, request, **kwargs):
+        return BiodataChangeList
+
+    def _search_ids(self, request, search_term):
+        # Computed once per request: used for both filtering and ordering
+        from . import search
+        if not hasattr(request, '_biodata_search_ids'):
+            request._biodata_search_ids = search.search_ids(
+                search_term, limit=getattr(settings, 'SEARCH_MAX_RESULTS', 500))
+        return request._biodata_search_ids
+
+    def get_search_results(self, request, queryset, search_term):
+        """Search the FTS5 index (all fields incl. the data JSON) instead of LIKE scans.
+
+        FTS5 only matches word prefixes, so phone and email fragments
+        (``3210``, ``gmail``) are still matched with a substring lookup.
+        """
+        from . import search
+        term = search_term.strip()
+        if not term or not search.is_available():
+            return super().get_search_results(request, queryset, search_term)
+        matches = (Q(pk__in=self._search_ids(request, search_term))
+                   | Q(user_phone__icontains=term) | Q(user_email__icontains=term))
+        return queryset.filter(matches), False
+
+    def get_ordering(self, request):
+        # Best match first unless a column header was clicked
+        from . import search
+        search_term = request.GET.get('q', '').strip()
+        if search_term and 'o' not in request.GET and search.is_available():
+            # Substring-only matches have no rank and go after the FTS hits
+            return (search.rank_expression(self._search_ids(request, search_term)).asc(nulls_last=True), '-pk')
+        return super().get_ordering(request)
+
+    def render_job_state(self, obj):
+        status = getattr(obj, 'latest_job_status', None)
+        if not status:
+            return "-"
+        started = getattr(obj, 'latest_job_started', None)
+        finished = getattr(obj, 'latest_job_finished', None)
+        if status == RenderJob.STATUS_DONE and started and finished:
+            return f"{status} ({(finished - started).total_seconds():.1f}s)"
+        return status
+    render_job_state.short_description = 'PDF/Email Job'
+
+    def profile_thumb(self, obj):
+        from .images import profile_derivative_url
+        url = profile_derivative_url(obj, 'thumb') if obj.profile_image else None
+        if url:
+            return format_html('<img src="{}" loading="lazy" style="width:40px;height:40px;border-radius:50%;object-fit:cover;"/>', url)
+        return "-"
+    profile_thumb.short_description = 'Photo'
 
     def payment_screenshot_thumb(self, obj):
         # Robust thumbnail for list view. Try storage URL first, fall back to MEDIA_URL + name.
@@ -32,31 +113,29 @@ class BiodataAdmin(admin.ModelAdmin):
                 url = f"{getattr(settings, 'MEDIA_URL', '/media/')}{name.lstrip('/')}" if name else None
 
             if url:
-                return format_html('<a href="{}" target="_blank"><img src="{}" style="max-height:40px;max-width:60px;"/></a>', url, url)
+                # Only show an existing thumbnail (made on save, or by
+                # `manage.py backfill_payment_thumbnails`); never resize here
+                from .images import payment_thumbnail_url
+                try:
+                    thumb_url = payment_thumbnail_url(obj, create=False)
+                except Exception:
+                    thumb_url = None
+                if not thumb_url:
+                    return format_html('<a href="{}" target="_blank">View</a>', url)
+                return format_html('<a href="{}" target="_blank"><img src="{}" loading="lazy" style="max-height:40px;max-width:60px;"/></a>', url, thumb_url)
         return "-"
     payment_screenshot_thumb.short_description = 'Payment Screenshot'
 
     def export_to_excel(self, request, queryset):
-        import csv
-        from django.http import HttpResponse
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = 'attachment; filename="biodata_export.csv"'
-        writer = csv.writer(response)
-        fields = ['id', 'title', 'user_name', 'user_email', 'template_choice', 'is_approved', 'created_at', 'payment_screenshot']
-        writer.writerow(fields)
-        for obj in queryset:
-            writer.writerow([
-                obj.id,
-                obj.title,
-                obj.user_name,
-                obj.user_email,
-                obj.template_choice,
-                obj.is_approved,
-                obj.created_at,
-                (getattr(obj.payment_screenshot, 'url', '') if getattr(obj, 'payment_screenshot', None) else '')
-            ])
-        return response
+        """Stream the selection as CSV, one column per field inside ``data``."""
+        from .exports import csv_response
+        return csv_response(queryset)
     export_to_excel.short_description = "Export selected to Excel (CSV)"
+
+    def export_to_xlsx(self, request, queryset):
+        from .exports import xlsx_response
+        return xlsx_response(queryset)
+    export_to_xlsx.short_description = "Export selected to Excel (XLSX)"
     # Set up file logger
     logger = logging.getLogger("biodata_admin")
     file_handler = logging.FileHandler("biodata_admin.log", encoding="utf-8")
@@ -66,488 +145,38 @@ class BiodataAdmin(admin.ModelAdmin):
     logger.setLevel(logging.DEBUG)
 
     def approve_biodata(self, request, queryset):
-        sent_count = 0
+        """Approve the selection and queue PDF render + email jobs.
+
+        Rendering and SMTP happen in ``manage.py render_worker`` so this
+        request returns immediately; job state shows in the changelist.
+        """
+        from django.core.signing import TimestampSigner
+        from django.urls import reverse
+        from .jobs import enqueue_approval
+        signer = TimestampSigner()
+        debug_mode = request.GET.get('debug_email', None)
+        approved_count = 0
+        queued_count = 0
         for obj in queryset:
             # Always run the workflow, even if already approved, for debugging
             obj.is_approved = True
-            from django.core.signing import TimestampSigner
-            from django.urls import reverse
-            signer = TimestampSigner()
             token = signer.sign(str(obj.pk))
             download_path = reverse('biodata-download', args=[obj.pk, token])
             obj.download_link = request.build_absolute_uri(download_path)
             obj.save()
-            logging.info(f"[ADMIN ACTION] Attempting to send approval email to: {obj.user_email!r} for biodata id {obj.pk}")
-            self.message_user(request, f"[DEBUG] Attempting to send approval email to: {obj.user_email!r} for biodata id {obj.pk}")
+            approved_count += 1
             if obj.user_email:
-                from django.core.mail import EmailMessage
-                debug_mode = request.GET.get('debug_email', None)
-                try:
-                    if debug_mode == 'plain':
-                        # Send a plain text email only
-                        self.logger.info("approve_biodata action started (plain email)")
-                        print("[DEBUG] approve_biodata action started (plain email)")
-                        email = EmailMessage(
-                            subject="Debug: Plain Email Test",
-                            body=f"This is a plain text test email for biodata id {obj.pk}.",
-                            from_email=getattr(settings, 'DEFAULT_FROM_EMAIL', 'noreply@yourdomain.com'),
-                            to=[obj.user_email]
-                        )
-                        email.send(fail_silently=False)
-                        self.message_user(request, f"[DEBUG] Plain email sent to {obj.user_email}")
-                        self.logger.info(f"Plain email sent to {obj.user_email}")
-                        print(f"[DEBUG] Plain email sent to {obj.user_email}")
-                    else:
-                        # Generate PDF directly from frontend-style HTML (NO templates needed!)
-                        self.logger.info("approve_biodata action started (Frontend PDF generation)")
-                        print("[DEBUG] approve_biodata action started (Frontend PDF generation)")
-                        from io import BytesIO
-                        from django.conf import settings
-                        import os
-                        
-                        # Generate complete frontend-style HTML
-                        html_content = self.build_frontend_html(obj)
-                        
-                        # Convert to PDF using Playwright (perfect browser rendering)
-                        pdf_buffer = self.html_to_pdf_playwright(html_content)
-                        
-                        # Send email with PDF
-                        email = EmailMessage(
-                            subject="Your Biodata PDF is Attached!",
-                            body=f"Dear {obj.user_name},\n\nYour biodata PDF is attached as requested.",
-                            from_email=getattr(settings, 'DEFAULT_FROM_EMAIL', 'noreply@yourdomain.com'),
-                            to=[obj.user_email]
-                        )
-                        email.attach(f"biodata_{obj.pk}.pdf", pdf_buffer.read(), 'application/pdf')
-                        email.send(fail_silently=False)
-                        sent_count += 1
-                        self.logger.info(f"Approval email with PDF sent to {obj.user_email}")
-                        print(f"[DEBUG] Approval email with PDF sent to {obj.user_email}")
-                        self.message_user(request, f"[DEBUG] Approval email with PDF sent to {obj.user_email}")
-                except Exception as e:
-                    self.message_user(request, f"[ERROR] Exception during email send: {e}", level=messages.ERROR)
-                    logging.exception(f"[ADMIN ACTION] Exception during email send for biodata id {obj.pk}")
+                job = enqueue_approval(obj, {'debug_email': debug_mode} if debug_mode else None)
+                queued_count += 1
+                self.logger.info(f"Queued render job {job.pk} for biodata id {obj.pk} ({obj.user_email})")
             else:
                 self.message_user(request, f"[DEBUG] No user_email set for biodata id {obj.pk}", level=messages.WARNING)
-        self.message_user(request, f"Approved {queryset.count()} biodata entries. Emails sent: {sent_count}")
+        self.message_user(request, f"Approved {approved_count} biodata entries. Emails queued: {queued_count}")
     approve_biodata.short_description = "Approve selected biodata and send email"
 
     def build_frontend_html(self, obj):
         """Build complete frontend-style HTML matching JS template-page.js logic"""
-        import os, base64, mimetypes
-        from django.conf import settings
-        
-        # Map template_choice to border image
-        border_images = {
-            "1": "White.png",
-            "2": "bg0.png",
-            "3": "bg6.png",
-            "4": "bg8.jpg",
-            "5": "bg9.jpg",
-            "6": "bg10.jpg",
-        }
-        border_image = border_images.get(str(obj.template_choice), "White.png")
-        border_path = os.path.join(settings.BASE_DIR.parent, 'assets', 'border', border_image)
-        
-        # Embed border image as base64
-        border_data_uri = ""
-        try:
-            if os.path.exists(border_path):
-                with open(border_path, 'rb') as bf:
-                    b = bf.read()
-                mime, _ = mimetypes.guess_type(border_path)
-                if not mime:
-                    mime = 'image/jpeg'
-                b64 = base64.b64encode(b).decode('ascii')
-                border_data_uri = f"data:{mime};base64,{b64}"
-        except Exception as e:
-            print(f"[DEBUG] Could not load border image: {e}")
-        
-        # Embed profile image as base64
-        profile_image_data_uri = ""
-        try:
-            if getattr(obj, 'profile_image', None) and getattr(obj.profile_image, 'name', None):
-                media_path = os.path.join(settings.MEDIA_ROOT, obj.profile_image.name)
-                if os.path.exists(media_path):
-                    with open(media_path, 'rb') as img_file:
-                        img_data = img_file.read()
-                    mime_type, _ = mimetypes.guess_type(media_path)
-                    if not mime_type:
-                        mime_type = 'image/jpeg'
-                    img_b64 = base64.b64encode(img_data).decode('ascii')
-                    profile_image_data_uri = f"data:{mime_type};base64,{img_b64}"
-        except Exception as e:
-            print(f"[DEBUG] Could not load profile image: {e}")
-
-        # Get biodata data
-        personal_details = obj.data.get('PersonalDetails', {}) if getattr(obj, 'data', None) else {}
-        family_details = obj.data.get('FamilyDetails', {}) if getattr(obj, 'data', None) else {}
-        habits_details = obj.data.get('HabitsDeclaration', {}) if getattr(obj, 'data', None) else {}
-        
-        # Route to specific template builder
-        if str(obj.template_choice) == "5":
-            # Template 5 has special right-side layout
-            return self.generate_template5_html(
-                obj, border_data_uri, profile_image_data_uri,
-                personal_details, family_details, habits_details
-            )
-        else:
-            # Templates 1-4, 6 use centered layout
-            return self.generate_standard_template_html(
-                obj, border_data_uri, profile_image_data_uri,
-                personal_details, family_details, habits_details
-            )
-
-    def generate_standard_template_html(self, obj, border_image_base64, profile_image_base64, personal, family, habits):
-        """Generate frontend-matching HTML for Templates 1-4, 6 (centered profile photo at top)"""
-        
-        # Profile image HTML (centered, circular)
-        profile_html = ""
-        if profile_image_base64:
-            profile_html = f'<img src="{profile_image_base64}" class="biodata-profile-image" alt="Profile" />'
-        
-        # Format sections - Split items into left/right columns
-        def format_section_items(details_dict):
-            items = []
-            for k, v in (details_dict or {}).items():
-                # Handle both old format (direct values) and new format ({label, value})
-                if isinstance(v, dict) and 'value' in v:
-                    actual_value = v.get('value', '')
-                    label_text = v.get('label', k.replace('_', ' ').title())
-                else:
-                    actual_value = v
-                    label_text = k.replace('_', ' ').title()
-                
-                # Only include non-empty values
-                if actual_value and str(actual_value).strip():
-                    items.append((label_text, actual_value))
-            
-            left_html = ""
-            right_html = ""
-            for i, (label, value) in enumerate(items):
-                item = f'''<div class="detail-item">
-                    <span class="detail-label">{label}</span>
-                    <span class="detail-value">{value}</span>
-                </div>'''
-                if i % 2 == 0:
-                    left_html += item
-                else:
-                    right_html += item
-            return f'<div class="detail-column-left">{left_html}</div><div class="detail-column-right">{right_html}</div>'
-        
-        personal_html = format_section_items(personal)
-        family_html = format_section_items(family)
-        habits_html = format_section_items(habits)
-        
-        # Get name from PersonalDetails instead of user_name (handle both formats)
-        name_field = personal.get('name', '') or personal.get('Name', '')
-        if isinstance(name_field, dict) and 'value' in name_field:
-            display_name = name_field.get('value', '') or obj.user_name or ''
-        else:
-            display_name = name_field or obj.user_name or ''
-        
-        html = f'''<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="utf-8" />
-    <title>Biodata - {obj.user_name}</title>
-    <style>
-        @page {{
-            size: A4 portrait;
-            margin: 5mm;
-        }}
-        * {{
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }}
-        body {{
-            font-family: "Times New Roman", serif;
-            background: white;
-            margin: 0;
-            padding: 0;
-        }}
-        #template-content {{
-            width: 100%;
-            min-height: 287mm;
-            background: white;
-            box-sizing: border-box;
-            margin: 0;
-            position: relative;
-            padding: 60px 80px;
-            background-image: url("{border_image_base64}");
-            background-size: 100% 100%;
-            background-position: center;
-            background-repeat: no-repeat;
-        }}
-        .biodata-template {{
-            max-width: 100%;
-            margin: 0;
-            background: transparent;
-            padding: 20px 0 0 0;
-            position: relative;
-            z-index: 1;
-            color: #2c3e50;
-        }}
-        .biodata-profile-image {{
-            width: 110px;
-            height: 110px;
-            border-radius: 50%;
-            object-fit: cover;
-            margin: 20px auto 10px;
-            display: block;
-            border: 3px solid #8b4513;
-            box-shadow: 0 4px 12px rgba(0, 0, 0, 0.2);
-        }}
-        .biodata-name {{
-            text-align: center;
-            font-size: 1.25rem;
-            font-weight: bold;
-            color: #2c3e50;
-            margin: 0 0 20px 0;
-            letter-spacing: 1px;
-        }}
-        .section-pill {{
-            background: linear-gradient(135deg, #e67e22, #d35400);
-            color: white;
-            padding: 7px 18px;
-            border-radius: 20px;
-            font-weight: 600;
-            margin: 0 auto 14px;
-            display: block;
-            width: fit-content;
-            font-size: 0.82rem;
-            text-transform: uppercase;
-            letter-spacing: 0.5px;
-            box-shadow: 0 2px 6px rgba(230, 126, 34, 0.4);
-        }}
-        .biodata-section {{
-            margin-bottom: 18px;
-        }}
-        .detail-columns {{
-            width: 100%;
-            margin-top: 8px;
-            padding: 0;
-            position: relative;
-            overflow: hidden;
-        }}
-        .detail-columns::before {{
-            content: '';
-            position: absolute;
-            left: 50%;
-            top: 0;
-            bottom: 0;
-            width: 1px;
-            background-color: #bdc3c7;
-            margin-left: -0.5px;
-        }}
-        .detail-column-left {{
-            width: 48%;
-            float: left;
-            padding-right: 11px;
-        }}
-        .detail-column-right {{
-            width: 48%;
-            float: right;
-            padding-left: 11px;
-        }}
-        .detail-item {{
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            padding: 2px 0;
-            margin-bottom: 2px;
-        }}
-        .detail-label {{
-            color: #2c3e50;
-            font-weight: 600;
-            font-size: 0.85rem;
-            width: 48%;
-            line-height: 1.4;
-        }}
-        .detail-value {{
-            color: #34495e;
-            font-size: 0.85rem;
-            width: 48%;
-            text-align: right;
-            font-weight: 500;
-            line-height: 1.4;
-        }}
-    </style>
-</head>
-<body>
-    <div id="template-content">
-        <div class="biodata-template">
-            {profile_html}
-            
-            {f'<div class="biodata-name">{display_name}</div>' if display_name else ''}
-            
-            {f'<div class="biodata-section"><div class="section-pill">PERSONAL DETAILS</div><div class="detail-columns">{personal_html}</div></div>' if personal else ''}
-            {f'<div class="biodata-section"><div class="section-pill">FAMILY DETAILS</div><div class="detail-columns">{family_html}</div></div>' if family else ''}
-            {f'<div class="biodata-section"><div class="section-pill">HABITS & DECLARATION</div><div class="detail-columns">{habits_html}</div></div>' if habits else ''}
-        </div>
-    </div>
-</body>
-</html>'''
-        return html
-
-    def generate_template5_html(self, obj, border_image_base64, profile_image_base64, personal, family, habits):
-        """Generate frontend-matching HTML for Template 5 (matches frontend: red border, blue section headers, Om symbol, BIO DATA, right-side profile photo, two-column layout)"""
-        # Get name from PersonalDetails (handle both formats)
-        name_field = personal.get('name', '') or personal.get('Name', '')
-        if isinstance(name_field, dict) and 'value' in name_field:
-            display_name = name_field.get('value', '') or obj.user_name or ''
-        else:
-            display_name = name_field or obj.user_name or ''
-        # Profile image HTML (right-side, rectangular)
-        if profile_image_base64:
-            profile_html = f'<img src="{profile_image_base64}" style="width:150px;height:180px;object-fit:cover;border:2px solid #000;margin-bottom:20px;display:block;" alt="Profile" />'
-        else:
-            profile_html = '<div style="width:150px;height:180px;background:#f0f0f0;border:2px solid #000;display:flex;align-items:center;justify-content:center;color:#666;font-size:12px;text-align:center;margin-bottom:20px;">Profile<br>Photo</div>'
-        def format_section_items(details_dict):
-            items = []
-            for k, v in (details_dict or {}).items():
-                # Handle both old format (direct values) and new format ({label, value})
-                if isinstance(v, dict) and 'value' in v:
-                    actual_value = v.get('value', '')
-                    label_text = v.get('label', k.replace('_', ' ').title())
-                else:
-                    actual_value = v
-                    label_text = k.replace('_', ' ').title()
-                
-                # Only include non-empty values
-                if actual_value and str(actual_value).strip():
-                    items.append((label_text, actual_value))
-            
-            left_html = ""
-            right_html = ""
-            for i, (label, value) in enumerate(items):
-                item = f'''<div style="margin-bottom:8px;font-size:12px;line-height:1.4;">
-                    <div style="color:#4169e1;margin-bottom:2px;font-weight:bold;">{label}</div>
-                    <div style="color:#000;">{value}</div>
-                </div>'''
-                if i % 2 == 0:
-                    left_html += item
-                else:
-                    right_html += item
-            return left_html, right_html
-        personal_left, personal_right = format_section_items(personal)
-        family_left, family_right = format_section_items(family)
-        habits_left, habits_right = format_section_items(habits)
-        html = f'''<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="utf-8" />
-    <title>Biodata - {display_name}</title>
-    <style>
-        @page {{
-            size: A4 portrait;
-            margin: 5mm;
-        }}
-        * {{
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }}
-        body {{
-            font-family: Arial, sans-serif;
-            background: white;
-        }}
-        #template-content {{
-            width: 700px;
-            margin: 20px auto;
-            border: 8px solid #dc143c;
-            padding: 0;
-            background: #fff;
-            min-height: 800px;
-            position: relative;
-            box-sizing: border-box;
-        }}
-        .biodata-header {{
-            text-align: center;
-            margin-bottom: 15px;
-            padding-top: 30px;
-        }}
-        .biodata-logo {{
-            font-size: 24px;
-            color: #dc143c;
-            font-weight: bold;
-        }}
-        .biodata-title {{
-            font-size: 18px;
-            color: #dc143c;
-            font-weight: bold;
-            letter-spacing: 1px;
-        }}
-        .main-content {{
-            width: 100%;
-            display: flex;
-            box-sizing: border-box;
-            padding: 40px 20px 30px 20px;
-        }}
-        .content-left {{
-            flex: 1;
-            padding: 0 10px;
-        }}
-        .content-right {{
-            width: 200px;
-            display: flex;
-            flex-direction: column;
-            align-items: center;
-        }}
-        .section-title {{
-            background: #4169e1;
-            color: #fff;
-            padding: 8px 15px;
-            font-weight: bold;
-            font-size: 14px;
-            margin: 20px 0 10px 0;
-            width: fit-content;
-            text-transform: uppercase;
-        }}
-        .section-title:first-of-type {{
-            margin-top: 0;
-        }}
-        .details-grid {{
-            display: grid;
-            grid-template-columns: 1fr 1fr;
-            gap: 20px;
-            margin-bottom: 15px;
-        }}
-    </style>
-</head>
-<body>
-    <div id="template-content">
-        <div class="biodata-header">
-            <div class="biodata-logo">🕉</div>
-            <div class="biodata-title">BIO DATA</div>
-        </div>
-        <div class="main-content">
-            <div class="content-left">
-                <div class="section-title">PERSONAL DETAILS</div>
-                <div class="details-grid">
-                    <div>{personal_left}</div>
-                    <div>{personal_right}</div>
-                </div>
-                <div class="section-title">FAMILY DETAILS</div>
-                <div class="details-grid">
-                    <div>{family_left}</div>
-                    <div>{family_right}</div>
-                </div>
-                <div class="section-title">HABITS & DECLARATION</div>
-                <div class="details-grid">
-                    <div>{habits_left}</div>
-                    <div>{habits_right}</div>
-                </div>
-            </div>
-            <div class="content-right">
-                {profile_html}
-            </div>
-        </div>
-    </div>
-</body>
-</html>'''
-        return html
+        return html_templates.build_frontend_html(obj)
 
     def payment_screenshot_preview(self, obj):
         """Show a larger preview in the change form (readonly)."""
@@ -564,46 +193,38 @@ class BiodataAdmin(admin.ModelAdmin):
         return format_html('<a href="{}" target="_blank"><img src="{}" style="max-height:220px;max-width:320px;border:1px solid #ccc;"/></a>', url, url)
     payment_screenshot_preview.short_description = 'Payment Screenshot Preview'
 
-    def _format_detail_grid(self, details_dict):
-        """Format details as grid items matching frontend"""
-        items = [(k, v) for k, v in (details_dict or {}).items() if v and str(v).strip()]
-        html_items = ""
-        for key, value in items:
-            key_title = key.replace('_', ' ').title()
-            html_items += f'''<div class="detail-item">
-                <span class="detail-label">{key_title}</span>
-                <span class="detail-value">{value}</span>
-            </div>'''
-        return html_items
 
-    def html_to_pdf_playwright(self, html_content):
-        """Convert HTML to PDF using Playwright (Chrome) for perfect rendering"""
-        from io import BytesIO
-        import tempfile
-        import os
-        
-        try:
-            from playwright.sync_api import sync_playwright
-            
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.html', delete=False, encoding='utf-8') as f:
-                f.write(html_content)
-                temp_path = f.name
-            
-            try:
-                with sync_playwright() as p:
-                    browser = p.chromium.launch(headless=True)
-                    page = browser.new_page()
-                    page.goto(f'file:///{temp_path}')
-                    page.wait_for_timeout(1000)  # Wait for fonts/images to load
-                    pdf_bytes = page.pdf(
-                        format='A4',
-                        print_background=True,
-                        margin={'top': '0', 'right': '0', 'bottom': '0', 'left': '0'}
-                    )
-                    browser.close()
-                    return BytesIO(pdf_bytes)
-            finally:
-                if os.path.exists(temp_path):
-                    os.unlink(temp_path)
-        except ImportError:
-            raise Exception("Playwright not installed")
+@admin.register(RenderJob)
+class RenderJobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'biodata', 'status', 'attempts', 'worker', 'created_at', 'started_at', 'finished_at', 'duration')
+    list_filter = ('status',)
+    list_select_related = ('biodata',)
+    readonly_fields = ('created_at', 'started_at', 'finished_at', 'worker', 'attempts', 'error')
+    actions = ['requeue_jobs']
+
+    def requeue_jobs(self, request, queryset):
+        count = queryset.exclude(status=RenderJob.STATUS_RUNNING).update(
+            status=RenderJob.STATUS_QUEUED, attempts=0, error='', run_after=timezone.now())
+        self.message_user(request, f"Re-queued {count} jobs.")
+    requeue_jobs.short_description = "Re-queue selected jobs"
+
+
+@admin.register(OutboxMessage)
+class OutboxMessageAdmin(admin.ModelAdmin):
+    list_display = ('id', 'subject', 'recipients', 'status', 'attempts', 'next_attempt_at', 'created_at', 'sent_at')
+    list_filter = ('status',)
+    search_fields = ('subject', 'dedupe_key')
+    readonly_fields = ('dedupe_key', 'attachment', 'attachment_biodata', 'attempts', 'last_error', 'created_at', 'sent_at')
+    actions = ['retry_messages']
+
+    def recipients(self, obj):
+        return ', '.join(obj.to)
+
+    def retry_messages(self, request, queryset):
+        # Failed uploads lost their spooled attachment and can't be resent
+        lost_attachment = Q(attachment='') & Q(attachment_biodata__isnull=True) & ~Q(attachment_name='')
+        queryset = queryset.exclude(status__in=[OutboxMessage.STATUS_SENT, OutboxMessage.STATUS_SENDING])
+        count = queryset.exclude(lost_attachment).update(
+            status=OutboxMessage.STATUS_PENDING, attempts=0, next_attempt_at=timezone.now(), last_error='')
+        self.message_user(request, f"Re-queued {count} messages.")
+    retry_messages.short_description = "Retry selected messages"
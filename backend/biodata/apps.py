@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class BiodataConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'biodata'
+
+    def ready(self):
+        from . import signals  # noqa: F401  (connect PDF cache invalidation)
+
+        from django.db.backends.signals import connection_created
+        from .sqlite import configure_sqlite_connection
+        connection_created.connect(configure_sqlite_connection, dispatch_uid='biodata-sqlite-pragmas')
@@ -0,0 +1,176 @@
+"""Image assets embedded into the PDF templates.
+
+Border backgrounds (up to ~1.7 MB) and profile photos are inlined as base64
+data URIs. Encoding them is memoized in a bounded in-process LRU cache keyed
+by (path, mtime, size), so an edited file is picked up automatically. The
+border images are prewarmed when the app starts (``settings.PDF_PREWARM_BORDERS``).
+
+When ``manage.py optimize_borders`` has produced print-resolution variants,
+``border_image_path`` resolves to them through the manifest in
+``settings.BORDER_PRINT_DIR``; otherwise the original files are used.
+"""
+import base64
+import json
+import logging
+import mimetypes
+import os
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# template_choice -> file in assets/border/ (matches js/template-page.js)
+BORDER_IMAGES = {
+    "1": "White.png",
+    "2": "bg0.png",
+    "3": "bg6.png",
+    "4": "bg8.jpg",
+    "5": "bg9.jpg",
+    "6": "bg10.jpg",
+}
+DEFAULT_BORDER_IMAGE = "White.png"
+MANIFEST_NAME = 'manifest.json'
+
+_manifest = {'key': None, 'borders': {}}
+_manifest_lock = threading.Lock()
+
+
+def border_print_dir():
+    return str(getattr(settings, 'BORDER_PRINT_DIR',
+                       os.path.join(settings.BASE_DIR.parent, 'assets', 'border', 'print')))
+
+
+def print_border_manifest():
+    """Return ``{source name: entry}`` from the optimized-border manifest (reloaded on change)."""
+    path = os.path.join(border_print_dir(), MANIFEST_NAME)
+    try:
+        st = os.stat(path)
+    except OSError:
+        return {}
+    key = (st.st_mtime_ns, st.st_size)
+    with _manifest_lock:
+        if _manifest['key'] != key:
+            try:
+                with open(path, encoding='utf-8') as f:
+                    _manifest['borders'] = json.load(f).get('borders', {})
+            except (OSError, ValueError):
+                logger.exception("Unreadable border manifest %s", path)
+                _manifest['borders'] = {}
+            _manifest['key'] = key
+        return _manifest['borders']
+
+
+def border_image_path(template_choice):
+    """Path of the border for a template, preferring the print-optimized variant."""
+    name = BORDER_IMAGES.get(str(template_choice), DEFAULT_BORDER_IMAGE)
+    entry = print_border_manifest().get(name)
+    if entry:
+        optimized = os.path.join(border_print_dir(), entry['file'])
+        if os.path.exists(optimized):
+            return optimized
+    return os.path.join(settings.BASE_DIR.parent, 'assets', 'border', name)
+
+
+class DataURICache:
+    """LRU cache of ``data:`` URIs bounded by their total size in characters."""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = int(max_bytes)
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, path):
+        """Return the data URI for ``path``, or ``''`` if it does not exist."""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return ''
+        key = (path, st.st_mtime_ns, st.st_size)
+        with self._lock:
+            uri = self._entries.get(key)
+            if uri is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return uri
+            self.misses += 1
+
+        with open(path, 'rb') as f:
+            raw = f.read()
+        mime, _ = mimetypes.guess_type(path)
+        uri = f"data:{mime or 'image/jpeg'};base64,{base64.b64encode(raw).decode('ascii')}"
+
+        with self._lock:
+            # Drop stale versions of the same file before storing the new one
+            for stale in [k for k in self._entries if k[0] == path and k != key]:
+                self._size -= len(self._entries.pop(stale))
+            if key not in self._entries and len(uri) <= self.max_bytes:
+                self._entries[key] = uri
+                self._size += len(uri)
+                while self._size > self.max_bytes:
+                    _old_key, old_uri = self._entries.popitem(last=False)
+                    self._size -= len(old_uri)
+        return uri
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._size,
+                'hits': self.hits,
+                'misses': self.misses,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_data_uri_cache():
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = DataURICache(getattr(settings, 'DATA_URI_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+    return _cache
+
+
+def data_uri(path):
+    """Cached base64 data URI for the file at ``path`` (``''`` if missing)."""
+    return get_data_uri_cache().get(path)
+
+
+def border_data_uri(template_choice):
+    return data_uri(border_image_path(template_choice))
+
+
+def prewarm_borders():
+    """Encode every template border so the first renders don't pay for it."""
+    for choice in BORDER_IMAGES:
+        try:
+            border_data_uri(choice)
+        except Exception:
+            logger.exception("Could not prewarm border image for template %s", choice)
+    logger.info("Border data URIs prewarmed: %s", get_data_uri_cache().stats())
+
+
+def start_border_prewarm():
+    """Run ``prewarm_borders`` on a background thread if PDF_PREWARM_BORDERS is set.
+
+    Only called from the processes that render (WSGI/ASGI entry points and
+    the render worker), so migrate, shell and other commands skip the work.
+    """
+    if not getattr(settings, 'PDF_PREWARM_BORDERS', True):
+        return None
+    thread = threading.Thread(target=prewarm_borders, name='prewarm-borders', daemon=True)
+    thread.start()
+    return thread
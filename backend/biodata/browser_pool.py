@@ -0,0 +1,290 @@
+"""Process-wide pool of warm headless Chromium browsers for PDF rendering.
+
+Launching Chromium costs seconds and hundreds of MB, so instead of starting a
+browser per biodata we keep a few of them running and hand out fresh pages.
+
+Playwright's sync API is bound to the thread that started it, therefore every
+browser lives on its own worker thread and callers submit a callable that is
+executed there with a new page:
+
+    pdf_bytes = get_browser_pool().run(lambda page: page.pdf())
+
+Configuration comes from ``settings.PDF_BROWSER_POOL`` (see ``DEFAULTS``).
+"""
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    # Number of browsers (and worker threads) kept warm
+    'SIZE': 2,
+    # Recycle a browser after this many renders to cap memory growth
+    'MAX_RENDERS_PER_BROWSER': 200,
+    # Seconds between liveness checks of an idle browser
+    'HEALTH_CHECK_INTERVAL': 60,
+    # Seconds a caller waits for a render before giving up
+    'TIMEOUT': 120,
+    'LAUNCH_ARGS': ['--disable-dev-shm-usage', '--no-sandbox'],
+}
+
+
+_overrides = {}
+
+
+def get_pool_settings():
+    """Return the pool configuration merged over ``DEFAULTS``."""
+    conf = dict(DEFAULTS)
+    conf.update(getattr(settings, 'PDF_BROWSER_POOL', {}) or {})
+    conf.update(_overrides)
+    return conf
+
+
+def configure_browser_pool(**overrides):
+    """Override pool settings for this process (before the pool is first used).
+
+    Render worker processes use this to keep a single browser each.
+    """
+    _overrides.update(overrides)
+
+
+class _BrowserSlot(threading.Thread):
+    """Worker thread owning one Playwright driver, browser and context."""
+
+    def __init__(self, pool, index):
+        super().__init__(name=f'pdf-browser-{index}', daemon=True)
+        self.pool = pool
+        self.index = index
+        self.browser = None
+        self.context = None
+        self.renders = 0
+        self.total_renders = 0
+        self.launches = 0
+        self.last_error = None
+        self.last_health_check = 0.0
+        self._playwright = None
+
+    # -- browser lifecycle (worker thread only) --------------------------
+    def _launch(self):
+        conf = self.pool.conf
+        self.browser = self._playwright.chromium.launch(headless=True, args=list(conf['LAUNCH_ARGS']))
+        self.context = self.browser.new_context()
+        self.renders = 0
+        self.launches += 1
+        self.last_health_check = time.monotonic()
+        logger.info("Browser slot %s launched Chromium (launch #%s)", self.index, self.launches)
+
+    def _close(self):
+        for closable in (self.context, self.browser):
+            if closable is None:
+                continue
+            try:
+                closable.close()
+            except Exception:
+                logger.debug("Browser slot %s: error while closing", self.index, exc_info=True)
+        self.context = None
+        self.browser = None
+
+    def _healthy(self):
+        if self.browser is None or self.context is None:
+            return False
+        interval = self.pool.conf['HEALTH_CHECK_INTERVAL']
+        if time.monotonic() - self.last_health_check < interval:
+            return True
+        self.last_health_check = time.monotonic()
+        try:
+            return self.browser.is_connected()
+        except Exception:
+            return False
+
+    def _ensure_browser(self):
+        if not self._healthy():
+            if self.browser is not None:
+                logger.warning("Browser slot %s failed health check, relaunching", self.index)
+            self._close()
+            self._launch()
+
+    def _check_idle_browser(self):
+        """Replace a running browser that died while the slot was waiting."""
+        if self.browser is None or self._healthy():
+            return
+        logger.warning("Idle browser slot %s failed health check, relaunching", self.index)
+        self._close()
+        try:
+            self._launch()
+        except Exception as exc:
+            # Leave it closed; the next task launches (and reports) again
+            logger.exception("Browser slot %s could not relaunch Chromium", self.index)
+            self.last_error = exc
+            self._close()
+
+    # -- main loop ---------------------------------------------------------
+    def run(self):
+        try:
+            from playwright.sync_api import sync_playwright
+            manager = sync_playwright()
+            self._playwright = manager.start()
+        except Exception as exc:
+            logger.exception("Browser slot %s could not start Playwright", self.index)
+            self.last_error = exc
+            self._serve_failures(exc)
+            return
+
+        try:
+            while True:
+                try:
+                    item = self.pool._tasks.get(timeout=self.pool.conf['HEALTH_CHECK_INTERVAL'])
+                except queue.Empty:
+                    self._check_idle_browser()
+                    continue
+                if item is None:
+                    break
+                func, future = item
+                if not future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    self._ensure_browser()
+                    page = self.context.new_page()
+                    try:
+                        result = func(page)
+                    finally:
+                        page.close()
+                except BaseException as exc:
+                    self.last_error = exc
+                    future.set_exception(exc)
+                    # The browser may be in a bad state; start clean next time
+                    self._close()
+                    continue
+                self.renders += 1
+                self.total_renders += 1
+                future.set_result(result)
+                if self.renders >= self.pool.conf['MAX_RENDERS_PER_BROWSER']:
+                    logger.info("Browser slot %s recycling after %s renders", self.index, self.renders)
+                    self._close()
+        finally:
+            self._close()
+            try:
+                self._playwright.stop()
+            except Exception:
+                pass
+
+    def _serve_failures(self, exc):
+        """Fail queued tasks instead of leaving callers waiting forever."""
+        while True:
+            item = self.pool._tasks.get()
+            if item is None:
+                break
+            func, future = item
+            if future.set_running_or_notify_cancel():
+                future.set_exception(exc)
+
+    def stats(self):
+        return {
+            'slot': self.index,
+            'alive': self.is_alive(),
+            # Only read plain attributes here; Playwright objects belong to the slot thread
+            'browser_running': self.browser is not None,
+            'renders_since_launch': self.renders,
+            'total_renders': self.total_renders,
+            'launches': self.launches,
+            'last_error': repr(self.last_error) if self.last_error else None,
+        }
+
+
+class BrowserPool:
+    """A fixed number of warm browsers sharing one task queue."""
+
+    def __init__(self, conf=None):
+        self.conf = conf or get_pool_settings()
+        self._tasks = queue.Queue()
+        self._slots = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _start(self):
+        with self._lock:
+            if self._slots or self._closed:
+                return
+            for index in range(max(1, int(self.conf['SIZE']))):
+                slot = _BrowserSlot(self, index)
+                slot.start()
+                self._slots.append(slot)
+
+    def submit(self, func):
+        """Schedule ``func(page)`` on a pooled browser and return a Future."""
+        if self._closed:
+            raise RuntimeError("Browser pool has been shut down")
+        self._start()
+        future = Future()
+        self._tasks.put((func, future))
+        return future
+
+    def run(self, func, timeout=None):
+        """Run ``func(page)`` on a pooled browser and return its result."""
+        if timeout is None:
+            timeout = self.conf['TIMEOUT']
+        return self.submit(func).result(timeout=timeout)
+
+    def health_check(self):
+        """Return per-slot status; slots whose thread died are replaced."""
+        with self._lock:
+            for position, slot in enumerate(self._slots):
+                if not slot.is_alive() and not self._closed:
+                    logger.warning("Browser slot %s thread died, restarting", slot.index)
+                    replacement = _BrowserSlot(self, slot.index)
+                    replacement.start()
+                    self._slots[position] = replacement
+            return [slot.stats() for slot in self._slots]
+
+    def shutdown(self, wait=True):
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            slots = list(self._slots)
+        for _ in slots:
+            self._tasks.put(None)
+        if wait:
+            for slot in slots:
+                slot.join(timeout=10)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_browser_pool():
+    """Return the process-wide browser pool, creating it on first use."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = BrowserPool()
+    return _pool
+
+
+def shutdown_browser_pool():
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown()
+
+
+def _reset_after_fork():
+    # Browser threads do not survive fork(); the child builds its own pool.
+    global _pool, _pool_lock
+    _pool = None
+    _pool_lock = threading.Lock()
+
+
+atexit.register(shutdown_browser_pool)
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
@@ -0,0 +1,194 @@
+"""Streaming CSV/XLSX export of biodata with the ``data`` sections flattened.
+
+Rows are read with ``queryset.iterator()`` and written to the response as
+they are produced, so memory use does not grow with the number of rows.
+Every ``{section: {key: {label, value}}}`` entry becomes its own
+``Section.key`` column; a first pass over ``data`` collects the columns.
+"""
+import csv
+import zipfile
+from xml.sax.saxutils import escape
+
+from django.http import StreamingHttpResponse
+
+CHUNK_SIZE = 500
+BASE_COLUMNS = ('id', 'title', 'user_name', 'user_email', 'user_phone', 'template_choice',
+                'is_approved', 'created_at', 'payment_screenshot')
+SECTION_ORDER = ('PersonalDetails', 'FamilyDetails', 'HabitsDeclaration')
+
+
+def section_columns(queryset):
+    """``[(section, key), ...]`` for every field present in ``queryset``'s data."""
+    seen = {}
+    for data in queryset.values_list('data', flat=True).iterator(chunk_size=CHUNK_SIZE):
+        if not isinstance(data, dict):
+            continue
+        for section, fields in data.items():
+            if isinstance(fields, dict):
+                keys = seen.setdefault(section, {})
+                for key in fields:
+                    keys.setdefault(key, None)
+    order = [s for s in SECTION_ORDER if s in seen] + sorted(s for s in seen if s not in SECTION_ORDER)
+    return [(section, key) for section in order for key in seen[section]]
+
+
+def _field_value(item):
+    if isinstance(item, dict):
+        item = item.get('value', '')
+    return '' if item is None else item
+
+
+def _base_value(obj, column):
+    if column == 'payment_screenshot':
+        field = obj.payment_screenshot
+        if not getattr(field, 'name', None):
+            return ''
+        try:
+            return field.url
+        except Exception:
+            return field.name
+    return getattr(obj, column)
+
+
+def iter_rows(queryset):
+    """Header row followed by one list per biodata, in id order."""
+    from .models import Biodata
+    # Re-select by pk: drops changelist annotations and deferred fields
+    rows = Biodata.objects.filter(pk__in=queryset.values('pk')).order_by('id')
+    columns = section_columns(rows)
+    yield list(BASE_COLUMNS) + [f'{section}.{key}' for section, key in columns]
+    for obj in rows.iterator(chunk_size=CHUNK_SIZE):
+        data = obj.data if isinstance(obj.data, dict) else {}
+        row = [_base_value(obj, column) for column in BASE_COLUMNS]
+        for section, key in columns:
+            fields = data.get(section)
+            row.append(_field_value(fields.get(key)) if isinstance(fields, dict) else '')
+        yield row
+
+
+class _Echo:
+    """File-like object whose write() returns the data (for csv.writer)."""
+
+    def write(self, value):
+        return value
+
+
+def stream_csv(rows):
+    writer = csv.writer(_Echo())
+    for row in rows:
+        yield writer.writerow(row)
+
+
+class _ZipStream:
+    """Write-only, non-seekable sink that zipfile writes into; drained by the generator."""
+
+    def __init__(self):
+        self.chunks = []
+        self.position = 0
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self.chunks)
+        self.chunks = []
+        return data
+
+
+XLSX_STATIC_PARTS = {
+    '[Content_Types].xml': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '</Types>'
+    ),
+    '_rels/.rels': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>'
+        '</Relationships>'
+    ),
+    'xl/workbook.xml': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        '<sheets><sheet name="Biodata" sheetId="1" r:id="rId1"/></sheets></workbook>'
+    ),
+    'xl/_rels/workbook.xml.rels': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet1.xml"/>'
+        '</Relationships>'
+    ),
+}
+# Characters XML 1.0 does not allow (Excel rejects the file otherwise)
+_XML_INVALID = dict.fromkeys(c for c in range(32) if c not in (9, 10, 13))
+
+
+def _column_letter(index):
+    letters = ''
+    index += 1
+    while index:
+        index, rem = divmod(index - 1, 26)
+        letters = chr(65 + rem) + letters
+    return letters
+
+
+def _xlsx_row(number, values):
+    cells = []
+    for i, value in enumerate(values):
+        ref = f'{_column_letter(i)}{number}'
+        if isinstance(value, bool):
+            cells.append(f'<c r="{ref}" t="b"><v>{int(value)}</v></c>')
+        elif isinstance(value, (int, float)):
+            cells.append(f'<c r="{ref}"><v>{value}</v></c>')
+        elif value in (None, ''):
+            continue
+        else:
+            text = escape(str(value).translate(_XML_INVALID))
+            cells.append(f'<c r="{ref}" t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>')
+    return f'<row r="{number}">{"".join(cells)}</row>'
+
+
+def stream_xlsx(rows, flush_every=200):
+    """Minimal single-sheet XLSX (inline strings), written as a zip stream."""
+    sink = _ZipStream()
+    with zipfile.ZipFile(sink, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for name, content in XLSX_STATIC_PARTS.items():
+            archive.writestr(name, content)
+        yield sink.drain()
+        with archive.open('xl/worksheets/sheet1.xml', 'w', force_zip64=True) as sheet:
+            sheet.write(b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                        b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>')
+            for number, row in enumerate(rows, start=1):
+                sheet.write(_xlsx_row(number, row).encode('utf-8'))
+                if number % flush_every == 0:
+                    yield sink.drain()
+            sheet.write(b'</sheetData></worksheet>')
+    yield sink.drain()
+
+
+def csv_response(queryset, filename='biodata_export.csv'):
+    response = StreamingHttpResponse(stream_csv(iter_rows(queryset)), content_type='text/csv')
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
+def xlsx_response(queryset, filename='biodata_export.xlsx'):
+    response = StreamingHttpResponse(
+        stream_xlsx(iter_rows(queryset)),
+        content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    )
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
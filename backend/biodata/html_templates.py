@@ -0,0 +1,427 @@
+"""Precompiled HTML shells for the frontend-matching PDF templates.
+
+Each template's document shell (markup + CSS) is parsed once at import time
+into a ``CompiledShell``; rendering a biodata only builds the per-record
+fragments (profile photo, name, detail columns) and joins them into the
+precompiled literal parts. ``manage.py bench_html_build`` reports the
+per-record cost. ``build_frontend_html`` is the entry point used by the PDF
+renderers and the admin.
+"""
+import logging
+import os
+import re
+
+logger = logging.getLogger(__name__)
+
+SLOT_RE = re.compile(r'\[\[(\w+)\]\]')
+
+
+class CompiledShell:
+    """A static document split once into literal parts and named ``[[slots]]``."""
+
+    def __init__(self, source):
+        pieces = SLOT_RE.split(source)
+        # Even indexes are literal text, odd indexes are slot names
+        self.literals = pieces[0::2]
+        self.slots = pieces[1::2]
+        self._pairs = list(zip(self.slots, self.literals[1:]))
+
+    def render(self, **fragments):
+        out = [self.literals[0]]
+        append = out.append
+        for name, literal in self._pairs:
+            append(fragments.get(name, ''))
+            append(literal)
+        return ''.join(out)
+
+
+def section_items(details):
+    """Return ``(label, value)`` pairs for the non-empty fields of a section.
+
+    Handles both the normalized ``{label, value}`` format and legacy plain values.
+    """
+    items = []
+    for key, raw in (details or {}).items():
+        if isinstance(raw, dict) and 'value' in raw:
+            value = raw['value']
+            if not value or not str(value).strip():
+                continue
+            # Only derive the fallback label when the stored one is missing
+            label = raw['label'] if 'label' in raw else key.replace('_', ' ').title()
+        else:
+            value = raw
+            if not value or not str(value).strip():
+                continue
+            label = key.replace('_', ' ').title()
+        items.append((label, value))
+    return items
+
+
+def split_columns(items, item_html):
+    """Alternate items between the left and right column; returns two HTML strings."""
+    return (
+        ''.join([item_html(label, value) for label, value in items[0::2]]),
+        ''.join([item_html(label, value) for label, value in items[1::2]]),
+    )
+
+
+def display_name(obj, personal):
+    name_field = personal.get('name', '') or personal.get('Name', '')
+    if isinstance(name_field, dict) and 'value' in name_field:
+        return name_field.get('value', '') or obj.user_name or ''
+    return name_field or obj.user_name or ''
+
+
+# -- Templates 1-4, 6: centered circular photo ------------------------------
+
+STANDARD_SHELL = CompiledShell('''<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="utf-8" />
+    <title>Biodata - [[title]]</title>
+    <style>
+        @page {
+            size: A4 portrait;
+            margin: 5mm;
+        }
+        * {
+            margin: 0;
+            padding: 0;
+            box-sizing: border-box;
+        }
+        body {
+            font-family: "Times New Roman", serif;
+            background: white;
+            margin: 0;
+            padding: 0;
+        }
+        #template-content {
+            width: 100%;
+            min-height: 287mm;
+            background: white;
+            box-sizing: border-box;
+            margin: 0;
+            position: relative;
+            padding: 60px 80px;
+            background-image: url("[[border]]");
+            background-size: 100% 100%;
+            background-position: center;
+            background-repeat: no-repeat;
+        }
+        .biodata-template {
+            max-width: 100%;
+            margin: 0;
+            background: transparent;
+            padding: 20px 0 0 0;
+            position: relative;
+            z-index: 1;
+            color: #2c3e50;
+        }
+        .biodata-profile-image {
+            width: 110px;
+            height: 110px;
+            border-radius: 50%;
+            object-fit: cover;
+            margin: 20px auto 10px;
+            display: block;
+            border: 3px solid #8b4513;
+            box-shadow: 0 4px 12px rgba(0, 0, 0, 0.2);
+        }
+        .biodata-name {
+            text-align: center;
+            font-size: 1.25rem;
+            font-weight: bold;
+            color: #2c3e50;
+            margin: 0 0 20px 0;
+            letter-spacing: 1px;
+        }
+        .section-pill {
+            background: linear-gradient(135deg, #e67e22, #d35400);
+            color: white;
+            padding: 7px 18px;
+            border-radius: 20px;
+            font-weight: 600;
+            margin: 0 auto 14px;
+            display: block;
+            width: fit-content;
+            font-size: 0.82rem;
+            text-transform: uppercase;
+            letter-spacing: 0.5px;
+            box-shadow: 0 2px 6px rgba(230, 126, 34, 0.4);
+        }
+        .biodata-section {
+            margin-bottom: 18px;
+        }
+        .detail-columns {
+            width: 100%;
+            margin-top: 8px;
+            padding: 0;
+            position: relative;
+            overflow: hidden;
+        }
+        .detail-columns::before {
+            content: '';
+            position: absolute;
+            left: 50%;
+            top: 0;
+            bottom: 0;
+            width: 1px;
+            background-color: #bdc3c7;
+            margin-left: -0.5px;
+        }
+        .detail-column-left {
+            width: 48%;
+            float: left;
+            padding-right: 11px;
+        }
+        .detail-column-right {
+            width: 48%;
+            float: right;
+            padding-left: 11px;
+        }
+        .detail-item {
+            display: flex;
+            justify-content: space-between;
+            align-items: center;
+            padding: 2px 0;
+            margin-bottom: 2px;
+        }
+        .detail-label {
+            color: #2c3e50;
+            font-weight: 600;
+            font-size: 0.85rem;
+            width: 48%;
+            line-height: 1.4;
+        }
+        .detail-value {
+            color: #34495e;
+            font-size: 0.85rem;
+            width: 48%;
+            text-align: right;
+            font-weight: 500;
+            line-height: 1.4;
+        }
+    </style>
+</head>
+<body>
+    <div id="template-content">
+        <div class="biodata-template">
+            [[profile]]
+            [[name]]
+            [[sections]]
+        </div>
+    </div>
+</body>
+</html>''')
+
+
+def _standard_item(label, value):
+    return f'<div class="detail-item"><span class="detail-label">{label}</span><span class="detail-value">{value}</span></div>'
+
+
+def _standard_section(title, details):
+    if not details:
+        return ''
+    left, right = split_columns(section_items(details), _standard_item)
+    return ''.join((
+        '<div class="biodata-section"><div class="section-pill">', title,
+        '</div><div class="detail-columns"><div class="detail-column-left">', left,
+        '</div><div class="detail-column-right">', right, '</div></div></div>',
+    ))
+
+
+def build_standard_html(obj, border_data_uri, profile_data_uri, personal, family, habits):
+    name = display_name(obj, personal)
+    return STANDARD_SHELL.render(
+        title=str(obj.user_name),
+        border=border_data_uri,
+        profile=(f'<img src="{profile_data_uri}" class="biodata-profile-image" alt="Profile" />'
+                 if profile_data_uri else ''),
+        name=f'<div class="biodata-name">{name}</div>' if name else '',
+        sections=''.join((
+            _standard_section('PERSONAL DETAILS', personal),
+            _standard_section('FAMILY DETAILS', family),
+            _standard_section('HABITS & DECLARATION', habits),
+        )),
+    )
+
+
+# -- Template 5: red border, blue section headers, photo on the right --------
+
+TEMPLATE5_SHELL = CompiledShell('''<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="utf-8" />
+    <title>Biodata - [[title]]</title>
+    <style>
+        @page {
+            size: A4 portrait;
+            margin: 5mm;
+        }
+        * {
+            margin: 0;
+            padding: 0;
+            box-sizing: border-box;
+        }
+        body {
+            font-family: Arial, sans-serif;
+            background: white;
+        }
+        #template-content {
+            width: 700px;
+            margin: 20px auto;
+            border: 8px solid #dc143c;
+            padding: 0;
+            background: #fff;
+            min-height: 800px;
+            position: relative;
+            box-sizing: border-box;
+        }
+        .biodata-header {
+            text-align: center;
+            margin-bottom: 15px;
+            padding-top: 30px;
+        }
+        .biodata-logo {
+            font-size: 24px;
+            color: #dc143c;
+            font-weight: bold;
+        }
+        .biodata-title {
+            font-size: 18px;
+            color: #dc143c;
+            font-weight: bold;
+            letter-spacing: 1px;
+        }
+        .main-content {
+            width: 100%;
+            display: flex;
+            box-sizing: border-box;
+            padding: 40px 20px 30px 20px;
+        }
+        .content-left {
+            flex: 1;
+            padding: 0 10px;
+        }
+        .content-right {
+            width: 200px;
+            display: flex;
+            flex-direction: column;
+            align-items: center;
+        }
+        .section-title {
+            background: #4169e1;
+            color: #fff;
+            padding: 8px 15px;
+            font-weight: bold;
+            font-size: 14px;
+            margin: 20px 0 10px 0;
+            width: fit-content;
+            text-transform: uppercase;
+        }
+        .section-title:first-of-type {
+            margin-top: 0;
+        }
+        .details-grid {
+            display: grid;
+            grid-template-columns: 1fr 1fr;
+            gap: 20px;
+            margin-bottom: 15px;
+        }
+    </style>
+</head>
+<body>
+    <div id="template-content">
+        <div class="biodata-header">
+            <div class="biodata-logo">🕉</div>
+            <div class="biodata-title">BIO DATA</div>
+        </div>
+        <div class="main-content">
+            <div class="content-left">
+                <div class="section-title">PERSONAL DETAILS</div>
+                <div class="details-grid">
+                    <div>[[personal_left]]</div>
+                    <div>[[personal_right]]</div>
+                </div>
+                <div class="section-title">FAMILY DETAILS</div>
+                <div class="details-grid">
+                    <div>[[family_left]]</div>
+                    <div>[[family_right]]</div>
+                </div>
+                <div class="section-title">HABITS & DECLARATION</div>
+                <div class="details-grid">
+                    <div>[[habits_left]]</div>
+                    <div>[[habits_right]]</div>
+                </div>
+            </div>
+            <div class="content-right">
+                [[profile]]
+            </div>
+        </div>
+    </div>
+</body>
+</html>''')
+
+TEMPLATE5_PHOTO_PLACEHOLDER = (
+    '<div style="width:150px;height:180px;background:#f0f0f0;border:2px solid #000;display:flex;'
+    'align-items:center;justify-content:center;color:#666;font-size:12px;text-align:center;'
+    'margin-bottom:20px;">Profile<br>Photo</div>'
+)
+
+
+def _template5_item(label, value):
+    return (f'<div style="margin-bottom:8px;font-size:12px;line-height:1.4;">'
+            f'<div style="color:#4169e1;margin-bottom:2px;font-weight:bold;">{label}</div>'
+            f'<div style="color:#000;">{value}</div></div>')
+
+
+def build_template5_html(obj, border_data_uri, profile_data_uri, personal, family, habits):
+    personal_left, personal_right = split_columns(section_items(personal), _template5_item)
+    family_left, family_right = split_columns(section_items(family), _template5_item)
+    habits_left, habits_right = split_columns(section_items(habits), _template5_item)
+    if profile_data_uri:
+        profile = (f'<img src="{profile_data_uri}" style="width:150px;height:180px;object-fit:cover;'
+                   f'border:2px solid #000;margin-bottom:20px;display:block;" alt="Profile" />')
+    else:
+        profile = TEMPLATE5_PHOTO_PLACEHOLDER
+    return TEMPLATE5_SHELL.render(
+        title=str(display_name(obj, personal)),
+        profile=profile,
+        personal_left=personal_left, personal_right=personal_right,
+        family_left=family_left, family_right=family_right,
+        habits_left=habits_left, habits_right=habits_right,
+    )
+
+
+
+def build_frontend_html(obj):
+    """Build complete frontend-style HTML matching JS template-page.js logic."""
+    from django.conf import settings
+    from .assets import border_data_uri, data_uri
+    from .images import profile_derivative, template_variant
+
+    # Embed border image as base64 (memoized, see biodata.assets)
+    border_image_data_uri = ""
+    try:
+        border_image_data_uri = border_data_uri(obj.template_choice)
+    except Exception:
+        logger.warning("Could not load border image for biodata %s", obj.pk, exc_info=True)
+
+    # Embed the render-size profile derivative (never the original upload)
+    profile_image_data_uri = ""
+    try:
+        if getattr(obj, 'profile_image', None) and getattr(obj.profile_image, 'name', None):
+            derivative = profile_derivative(obj, template_variant(obj.template_choice))
+            if derivative:
+                profile_image_data_uri = data_uri(os.path.join(settings.MEDIA_ROOT, derivative))
+    except Exception:
+        logger.warning("Could not load profile image for biodata %s", obj.pk, exc_info=True)
+
+    data = obj.data if isinstance(getattr(obj, 'data', None), dict) else {}
+    personal = data.get('PersonalDetails', {})
+    family = data.get('FamilyDetails', {})
+    habits = data.get('HabitsDeclaration', {})
+
+    # Template 5 has its own right-side photo layout; 1-4 and 6 are centered
+    builder = build_template5_html if str(obj.template_choice) == "5" else build_standard_html
+    return builder(obj, border_image_data_uri, profile_image_data_uri, personal, family, habits)
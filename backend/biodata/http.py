@@ -0,0 +1,126 @@
+"""HTTP helpers for serving stored files with validators and byte ranges."""
+import os
+import re
+
+from django.http import HttpResponse, HttpResponseNotModified, StreamingHttpResponse
+from django.utils.http import http_date, parse_etags, parse_http_date_safe
+
+CHUNK_SIZE = 64 * 1024
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+def is_not_modified(request, etags, last_modified=None):
+    """True if the client's cached copy (If-None-Match / If-Modified-Since) is current.
+
+    ``etags`` are the quoted strong ETags the resource may have;
+    ``last_modified`` is a Unix timestamp. If-None-Match wins when present.
+    """
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+    if if_none_match is not None:
+        client_etags = parse_etags(if_none_match)
+        return '*' in client_etags or any(etag in client_etags for etag in etags)
+    if_modified_since = parse_http_date_safe(request.META.get('HTTP_IF_MODIFIED_SINCE') or '')
+    return bool(if_modified_since and last_modified is not None and int(last_modified) <= if_modified_since)
+
+
+def not_modified_response(etag=None, last_modified=None):
+    response = HttpResponseNotModified()
+    if etag:
+        response['ETag'] = etag
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified)
+    return response
+
+
+def _file_size(fileobj):
+    try:
+        return os.fstat(fileobj.fileno()).st_size
+    except (AttributeError, OSError, ValueError):
+        position = fileobj.tell()
+        fileobj.seek(0, os.SEEK_END)
+        size = fileobj.tell()
+        fileobj.seek(position)
+        return size
+
+
+def _iter_range(fileobj, start, length):
+    try:
+        fileobj.seek(start)
+        remaining = length
+        while remaining > 0:
+            chunk = fileobj.read(min(CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+    finally:
+        fileobj.close()
+
+
+def parse_range(header, size):
+    """Parse a single ``bytes=`` range.
+
+    Returns ``(start, end)`` (inclusive), ``None`` to ignore the header
+    (malformed or multi-range: serve the whole file) or ``False`` when the
+    range cannot be satisfied.
+    """
+    match = RANGE_RE.match(header.strip())
+    if not match:
+        return None
+    first, last = match.groups()
+    if first == '' and last == '':
+        return None
+    if first == '':
+        # Suffix range: the last N bytes
+        length = int(last)
+        if length == 0:
+            return False
+        return max(0, size - length), size - 1
+    start = int(first)
+    end = size - 1 if last == '' else min(int(last), size - 1)
+    if start >= size or start > end:
+        return False
+    return start, end
+
+
+def _if_range_matches(request, etag, last_modified):
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if if_range is None:
+        return True
+    if if_range.startswith('"') or if_range.startswith('W/'):
+        return bool(etag) and if_range == etag
+    date = parse_http_date_safe(if_range)
+    return date is not None and last_modified is not None and int(last_modified) <= date
+
+
+def ranged_file_response(request, fileobj, content_type, etag=None, last_modified=None):
+    """Stream ``fileobj`` honouring a single byte ``Range`` (206/416 responses).
+
+    The file is closed once the response has been consumed.
+    """
+    size = _file_size(fileobj)
+    byte_range = None
+    range_header = request.META.get('HTTP_RANGE')
+    if range_header and request.method in ('GET', 'HEAD') and _if_range_matches(request, etag, last_modified):
+        byte_range = parse_range(range_header, size)
+
+    if byte_range is False:
+        fileobj.close()
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+    elif byte_range:
+        start, end = byte_range
+        response = StreamingHttpResponse(_iter_range(fileobj, start, end - start + 1),
+                                         status=206, content_type=content_type)
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+        response['Content-Length'] = str(end - start + 1)
+    else:
+        response = StreamingHttpResponse(_iter_range(fileobj, 0, size), content_type=content_type)
+        response['Content-Length'] = str(size)
+
+    response['Accept-Ranges'] = 'bytes'
+    if etag:
+        response['ETag'] = etag
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified)
+    return response
@@ -0,0 +1,144 @@
+"""Resized derivatives of uploaded profile photos.
+
+Phone uploads are often several MB, while the templates show them at
+110x110 (circular, templates 1-4 and 6) or 150x180 (template 5). Derivatives
+are generated once when a photo is uploaded (see ``biodata.signals``) and
+stored next to the original as ``profiles/derivatives/<stem>_<variant>.jpg``;
+PDF rendering and the list API only ever read those.
+"""
+import io
+import logging
+import os
+
+from django.core.files.base import ContentFile
+
+logger = logging.getLogger(__name__)
+
+# variant -> (width, height); PDF sizes are 2x the CSS size for print sharpness
+PROFILE_VARIANTS = {
+    'circle': (220, 220),
+    'template5': (300, 360),
+    'list': (192, 192),
+    'thumb': (80, 80),
+}
+# Payment screenshots are tall phone captures: scaled to fit, never cropped
+PAYMENT_VARIANTS = {
+    'thumb': (120, 120),
+}
+JPEG_QUALITY = 85
+
+
+def template_variant(template_choice):
+    """Derivative used by the PDF layout of ``template_choice``."""
+    return 'template5' if str(template_choice) == '5' else 'circle'
+
+
+def derivative_name(name, variant):
+    directory, filename = os.path.split(name)
+    stem = os.path.splitext(filename)[0]
+    return os.path.join(directory, 'derivatives', f"{stem}_{variant}.jpg").replace('\\', '/')
+
+
+def _render_variant(img, size, crop=True):
+    from PIL import ImageOps
+    if crop:
+        fitted = ImageOps.fit(img, size, method=3, centering=(0.5, 0.4))  # 3 = LANCZOS
+    else:
+        fitted = ImageOps.contain(img, size, method=3)
+    buf = io.BytesIO()
+    fitted.save(buf, 'JPEG', quality=JPEG_QUALITY, optimize=True, progressive=True)
+    return buf.getvalue()
+
+
+def generate_image_derivatives(field_file, variants=PROFILE_VARIANTS, crop=True):
+    """Write every variant of ``field_file``; returns ``{variant: storage name}``.
+
+    The original is decoded once, EXIF-rotated and center-cropped (or, with
+    ``crop=False``, scaled to fit) to each size.
+    """
+    from PIL import Image, ImageOps
+
+    storage = field_file.storage
+    with storage.open(field_file.name, 'rb') as f:
+        with Image.open(f) as img:
+            # Let the JPEG decoder downscale while decoding multi-MB phone photos
+            largest = max(variants.values())
+            img.draft('RGB', (largest[0] * 2, largest[1] * 2))
+            img = ImageOps.exif_transpose(img).convert('RGB')
+            written = {}
+            for variant, size in variants.items():
+                name = derivative_name(field_file.name, variant)
+                if storage.exists(name):
+                    storage.delete(name)
+                written[variant] = storage.save(name, ContentFile(_render_variant(img, size, crop)))
+    return written
+
+
+def generate_profile_derivatives(biodata):
+    if not getattr(biodata.profile_image, 'name', None):
+        return {}
+    try:
+        return generate_image_derivatives(biodata.profile_image)
+    except Exception:
+        logger.exception("Could not create profile derivatives for biodata %s", biodata.pk)
+        return {}
+
+
+def delete_image_derivatives(name, storage, variants=PROFILE_VARIANTS):
+    for variant in variants:
+        derivative = derivative_name(name, variant)
+        try:
+            if storage.exists(derivative):
+                storage.delete(derivative)
+        except Exception:
+            logger.warning("Could not delete derivative %s", derivative, exc_info=True)
+
+
+def profile_derivative(biodata, variant, create=True):
+    """Storage name of a profile derivative, or ``None`` if there is no photo.
+
+    Records uploaded before derivatives existed get theirs created on first
+    use (``create=True``); afterwards the original is never decoded again.
+    """
+    field = biodata.profile_image
+    if not getattr(field, 'name', None):
+        return None
+    name = derivative_name(field.name, variant)
+    if field.storage.exists(name):
+        return name
+    if not create or not field.storage.exists(field.name):
+        return None
+    written = generate_profile_derivatives(biodata)
+    return written.get(variant)
+
+
+def profile_derivative_path(biodata, variant):
+    name = profile_derivative(biodata, variant)
+    return biodata.profile_image.storage.path(name) if name else None
+
+
+def profile_derivative_url(biodata, variant, create=False):
+    name = profile_derivative(biodata, variant, create=create)
+    return biodata.profile_image.storage.url(name) if name else None
+
+
+def payment_thumbnail(biodata, create=True):
+    """Storage name of the payment screenshot thumbnail (made on first use)."""
+    field = biodata.payment_screenshot
+    if not getattr(field, 'name', None):
+        return None
+    name = derivative_name(field.name, 'thumb')
+    if field.storage.exists(name):
+        return name
+    if not create or not field.storage.exists(field.name):
+        return None
+    try:
+        return generate_image_derivatives(field, PAYMENT_VARIANTS, crop=False).get('thumb')
+    except Exception:
+        logger.exception("Could not create payment thumbnail for biodata %s", biodata.pk)
+        return None
+
+
+def payment_thumbnail_url(biodata, create=True):
+    name = payment_thumbnail(biodata, create=create)
+    return biodata.payment_screenshot.storage.url(name) if name else None
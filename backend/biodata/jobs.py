@@ -0,0 +1,263 @@
+"""Database-backed queue of PDF render + email delivery jobs.
+
+The admin approve action only enqueues ``RenderJob`` rows; the work happens
+in ``manage.py render_worker`` so admin requests return immediately. With
+``--concurrency`` the worker fans renders out over a process pool (see
+``process_jobs_parallel``) and hands each job's email to the outbox
+(``biodata.outbox``) as its PDF completes.
+"""
+import logging
+import os
+import socket
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Biodata, RenderJob
+from .outbox import queue_email, release_held_messages
+from .rendering import RenderTimings, render_biodata_pdf
+
+logger = logging.getLogger(__name__)
+
+
+def default_worker_name():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def enqueue_approval(biodata, options=None):
+    """Queue a render/delivery job for ``biodata``.
+
+    An already queued job for the same record is reused so repeated clicks
+    do not send duplicate emails.
+    """
+    options = options or {}
+    job = RenderJob.objects.filter(biodata=biodata, status=RenderJob.STATUS_QUEUED).first()
+    if job is not None:
+        if job.options != options:
+            job.options = options
+            job.save(update_fields=['options'])
+        return job
+    return RenderJob.objects.create(biodata=biodata, options=options)
+
+
+def requeue_stale_jobs():
+    """Put jobs whose worker died while running back on the queue.
+
+    The lost run counts as a failed attempt (``attempts`` was incremented
+    when it was claimed): a job that keeps killing its worker (OOM, browser
+    crash) is marked failed at RENDER_JOB_MAX_ATTEMPTS instead of taking a
+    worker down forever.
+    """
+    stale_after = getattr(settings, 'RENDER_JOB_STALE_AFTER', timedelta(minutes=15))
+    max_attempts = getattr(settings, 'RENDER_JOB_MAX_ATTEMPTS', 3)
+    now = timezone.now()
+    stale = RenderJob.objects.filter(status=RenderJob.STATUS_RUNNING, started_at__lt=now - stale_after)
+    error = 'Worker died or timed out while rendering'
+    failed = stale.filter(attempts__gte=max_attempts).update(
+        status=RenderJob.STATUS_FAILED, worker='', error=error, finished_at=now)
+    requeued = stale.filter(attempts__lt=max_attempts).update(
+        status=RenderJob.STATUS_QUEUED, worker='', error=error, run_after=now)
+    if failed:
+        logger.warning("Marked %s stale render jobs failed after %s attempts", failed, max_attempts)
+    return requeued
+
+
+def claim_jobs(worker, limit=1):
+    """Atomically mark up to ``limit`` queued jobs as running for ``worker``.
+
+    Claiming is a conditional UPDATE on the status column, which works on
+    SQLite (no SELECT ... FOR UPDATE SKIP LOCKED) and is safe with several
+    workers polling the same table.
+    """
+    claimed = []
+    candidates = (
+        RenderJob.objects.filter(status=RenderJob.STATUS_QUEUED, run_after__lte=timezone.now())
+        .order_by('created_at')
+        .values_list('pk', flat=True)[: limit * 4]
+    )
+    for pk in candidates:
+        updated = RenderJob.objects.filter(pk=pk, status=RenderJob.STATUS_QUEUED).update(
+            status=RenderJob.STATUS_RUNNING,
+            worker=worker,
+            started_at=timezone.now(),
+            finished_at=None,
+            attempts=F('attempts') + 1,
+        )
+        if updated:
+            claimed.append(RenderJob.objects.select_related('biodata').get(pk=pk))
+            if len(claimed) >= limit:
+                break
+    return claimed
+
+
+def queue_approval_email(job):
+    """Put the approval email (PDF attached at send time) in the outbox.
+
+    If the owner already asked for the PDF before approval, that held
+    message is sent instead, so they get a single email.
+    """
+    biodata = job.biodata
+    held = release_held_messages(biodata)
+    if held:
+        return held[0]
+    return queue_email(
+        biodata.user_email,
+        "Your Biodata PDF is Attached!",
+        f"Dear {biodata.user_name},\n\nYour biodata PDF is attached as requested.",
+        attachment_biodata=biodata,
+        attachment_name=f"biodata_{biodata.pk}.pdf",
+        dedupe_key=f"render-job:{job.pk}",
+    )
+
+
+def queue_plain_debug_email(job):
+    return queue_email(
+        job.biodata.user_email,
+        "Debug: Plain Email Test",
+        f"This is a plain text test email for biodata id {job.biodata.pk}.",
+        dedupe_key=f"render-job:{job.pk}",
+    )
+
+
+def mark_done(job):
+    job.status = RenderJob.STATUS_DONE
+    job.error = ''
+    job.finished_at = timezone.now()
+    job.save(update_fields=['status', 'error', 'finished_at'])
+
+
+def mark_failed(job, exc):
+    """Record a failure; the job is retried until RENDER_JOB_MAX_ATTEMPTS.
+
+    Each retry waits RENDER_JOB_RETRY_BACKOFF seconds, doubling per attempt,
+    so a persistently failing render is not re-claimed in a tight loop.
+    """
+    max_attempts = getattr(settings, 'RENDER_JOB_MAX_ATTEMPTS', 3)
+    backoff = getattr(settings, 'RENDER_JOB_RETRY_BACKOFF', 30)
+    job.status = RenderJob.STATUS_QUEUED if job.attempts < max_attempts else RenderJob.STATUS_FAILED
+    job.error = f"{type(exc).__name__}: {exc}"
+    job.finished_at = timezone.now()
+    job.run_after = job.finished_at + timedelta(seconds=backoff * 2 ** max(job.attempts - 1, 0))
+    job.save(update_fields=['status', 'error', 'finished_at', 'run_after'])
+
+
+def process_job(job):
+    """Render the PDF for a claimed job and queue its email. Returns True on success.
+
+    The PDF lands in the PDF cache, from which the outbox worker attaches it.
+    """
+    biodata = job.biodata
+    try:
+        if not biodata.user_email:
+            raise ValueError(f"No user_email set for biodata id {biodata.pk}")
+        if job.options.get('debug_email') == 'plain':
+            message = queue_plain_debug_email(job)
+        else:
+            timings = RenderTimings()
+            _pdf_bytes, cache_hit = render_biodata_pdf(biodata, timings=timings)
+            logger.info("Job %s biodata %s: %s", job.pk, biodata.pk,
+                        "PDF cache hit" if cache_hit else f"PDF timings {timings}")
+            message = queue_approval_email(job)
+    except Exception as exc:
+        logger.exception("Render job %s failed for biodata %s", job.pk, biodata.pk)
+        mark_failed(job, exc)
+        return False
+    mark_done(job)
+    logger.info("Render job %s: approval email queued for %s (outbox %s)", job.pk, biodata.user_email, message.pk)
+    return True
+
+
+# -- parallel rendering ------------------------------------------------------
+
+def available_memory_mb():
+    """Best-effort available RAM in MB, or ``None`` if it cannot be determined."""
+    try:
+        with open('/proc/meminfo') as f:
+            for line in f:
+                if line.startswith('MemAvailable:'):
+                    return int(line.split()[1]) // 1024
+    except OSError:
+        pass
+    try:
+        return os.sysconf('SC_AVPHYS_PAGES') * os.sysconf('SC_PAGE_SIZE') // (1024 * 1024)
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def render_concurrency(requested=None):
+    """Number of render processes to use, bounded by CPU count and memory.
+
+    ``requested`` defaults to ``settings.RENDER_CONCURRENCY``; 0 means "as many
+    as the box allows". Each process is assumed to need
+    ``settings.RENDER_WORKER_MEMORY_MB`` (one Chromium plus Django).
+    """
+    if requested is None:
+        requested = getattr(settings, 'RENDER_CONCURRENCY', 1)
+    limit = os.cpu_count() or 1
+    memory = available_memory_mb()
+    if memory is not None:
+        per_worker = getattr(settings, 'RENDER_WORKER_MEMORY_MB', 400)
+        limit = min(limit, max(1, memory // per_worker))
+    if not requested:
+        return limit
+    return max(1, min(int(requested), limit))
+
+
+def _init_render_process():
+    import django
+    from django.apps import apps
+    if not apps.ready:  # spawn start method: fresh interpreter
+        django.setup()
+    from django.db import connections
+    from .browser_pool import configure_browser_pool
+    # Never reuse the parent's database connections after fork
+    connections.close_all()
+    # Parallelism comes from processes; one warm browser per process is enough
+    configure_browser_pool(SIZE=1)
+    from .assets import start_border_prewarm
+    start_border_prewarm()
+
+
+def _render_job_pdf(biodata_pk):
+    """Process-pool entry point: render into the shared PDF cache."""
+    biodata = Biodata.objects.get(pk=biodata_pk)
+    timings = RenderTimings()
+    _pdf_bytes, cache_hit = render_biodata_pdf(biodata, timings=timings)
+    return cache_hit, timings.as_dict()
+
+
+def create_render_executor(concurrency):
+    from django.db import connections
+    # Children must open their own connections; don't let them inherit ours
+    connections.close_all()
+    return ProcessPoolExecutor(max_workers=concurrency, initializer=_init_render_process)
+
+
+def process_jobs_parallel(jobs, executor):
+    """Render ``jobs`` on ``executor`` and deliver them as renders complete.
+
+    Yields ``(job, ok)`` in completion order. Rendered PDFs land in the shared
+    PDF cache, so delivery in this process is a cache hit.
+    """
+    futures = {}
+    for job in jobs:
+        needs_render = job.biodata.user_email and job.options.get('debug_email') != 'plain'
+        if needs_render:
+            futures[executor.submit(_render_job_pdf, job.biodata_id)] = job
+        else:
+            yield job, process_job(job)
+    for future in as_completed(futures):
+        job = futures[future]
+        try:
+            cache_hit, timings = future.result()
+        except Exception as exc:
+            logger.error("Render job %s failed in render process: %s", job.pk, exc)
+            mark_failed(job, exc)
+            yield job, False
+            continue
+        logger.info("Job %s biodata %s rendered in pool: %s", job.pk, job.biodata_id,
+                    "cache hit" if cache_hit else timings)
+        yield job, process_job(job)
@@ -0,0 +1,103 @@
+"""Outgoing mail over one reused SMTP connection.
+
+``EmailMessage.send()`` opens a new connection per message: TCP connect,
+STARTTLS handshake and login to Gmail every time. ``Mailer`` keeps a single
+``get_connection()`` backend open across messages, reconnects when the
+server drops it and retries transient SMTP errors with exponential backoff.
+Messages are handed over one at a time so a retry never re-sends a message
+the server already accepted.
+"""
+import logging
+import smtplib
+import socket
+import time
+
+from django.conf import settings
+from django.core.mail import get_connection
+
+logger = logging.getLogger(__name__)
+
+# Errors worth retrying on a fresh connection
+TRANSIENT_ERRORS = (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError, socket.timeout, ConnectionError)
+
+
+def is_transient(exc):
+    if isinstance(exc, smtplib.SMTPRecipientsRefused):
+        return all(400 <= code < 500 for code, _msg in exc.recipients.values())
+    if isinstance(exc, smtplib.SMTPResponseException):
+        return 400 <= exc.smtp_code < 500
+    return isinstance(exc, TRANSIENT_ERRORS)
+
+
+class Mailer:
+    """Send messages through one long-lived connection.
+
+    Use as a context manager (or call ``close()``) so the connection is
+    closed with QUIT when done::
+
+        with Mailer() as mailer:
+            for message in messages:
+                mailer.send(message)
+    """
+
+    def __init__(self, connection=None, retries=None, backoff=None, max_backoff=30.0, sleep=time.sleep):
+        self.connection = connection or get_connection(fail_silently=False)
+        self.retries = getattr(settings, 'EMAIL_SEND_RETRIES', 3) if retries is None else retries
+        self.backoff = getattr(settings, 'EMAIL_RETRY_BACKOFF', 1.0) if backoff is None else backoff
+        self.max_backoff = max_backoff
+        self._sleep = sleep
+        self.sent = 0
+        self.reconnects = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        try:
+            self.connection.close()
+        except Exception:
+            logger.debug("Error closing mail connection", exc_info=True)
+
+    def _reconnect(self):
+        self.close()
+        self.reconnects += 1
+        self.connection.open()
+
+    def send(self, message):
+        """Send one message, retrying transient failures. Raises the last error."""
+        attempt = 0
+        while True:
+            try:
+                self.connection.open()  # no-op while the connection is up
+                sent = self.connection.send_messages([message])
+                if sent != 1:
+                    raise smtplib.SMTPException("Message was not accepted")
+                self.sent += 1
+                return
+            except Exception as exc:
+                attempt += 1
+                if attempt > self.retries or not is_transient(exc):
+                    raise
+                delay = min(self.max_backoff, self.backoff * 2 ** (attempt - 1))
+                logger.warning("Transient SMTP error (%s); retry %d/%d in %.1fs", exc, attempt, self.retries, delay)
+                self._sleep(delay)
+                try:
+                    self._reconnect()
+                except Exception:
+                    # Connecting failed too; the next loop iteration retries it
+                    logger.warning("SMTP reconnect failed", exc_info=True)
+
+    def send_messages(self, messages):
+        """Send ``messages`` in order; returns ``[(message, error or None), ...]``."""
+        results = []
+        for message in messages:
+            try:
+                self.send(message)
+                results.append((message, None))
+            except Exception as exc:
+                logger.error("Could not send mail to %s: %s", ', '.join(message.to), exc)
+                results.append((message, exc))
+        return results
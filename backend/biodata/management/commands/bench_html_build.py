@@ -0,0 +1,65 @@
+"""
+Microbenchmark of the per-record HTML build for the PDF templates.
+
+    python manage.py bench_html_build --iterations 2000
+    python manage.py bench_html_build --biodata-id 42
+"""
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from biodata import html_templates
+from biodata.models import Biodata
+
+
+SAMPLE_DATA = {
+    'PersonalDetails': {
+        key: {'label': key.replace('_', ' ').title(), 'value': f'Sample {key}'}
+        for key in ('name', 'date_of_birth', 'age', 'height', 'education', 'occupation',
+                    'income', 'religion', 'caste', 'gotra', 'city', 'complexion')
+    },
+    'FamilyDetails': {
+        key: {'label': key.replace('_', ' ').title(), 'value': f'Sample {key}'}
+        for key in ('father_name', 'father_occupation', 'mother_name', 'mother_occupation',
+                    'brothers', 'sisters', 'native_place', 'contact')
+    },
+    'HabitsDeclaration': {
+        key: {'label': key.replace('_', ' ').title(), 'value': 'No'}
+        for key in ('smoking', 'drinking', 'diet')
+    },
+}
+
+
+class Command(BaseCommand):
+    help = 'Measure the per-record HTML build cost of the precompiled PDF templates'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=1000)
+        parser.add_argument('--biodata-id', type=int, default=None, help='Use a stored record instead of sample data')
+
+    def handle(self, *args, **options):
+        if options['biodata_id']:
+            try:
+                biodata = Biodata.objects.get(pk=options['biodata_id'])
+            except Biodata.DoesNotExist:
+                raise CommandError(f"Biodata {options['biodata_id']} not found")
+        else:
+            biodata = Biodata(user_name='Sample User', data=SAMPLE_DATA)
+
+        data = biodata.data or {}
+        personal = data.get('PersonalDetails', {})
+        family = data.get('FamilyDetails', {})
+        habits = data.get('HabitsDeclaration', {})
+        # Short stand-ins: the data URIs are passed through untouched
+        border = 'data:image/png;base64,AAAA'
+        profile = 'data:image/jpeg;base64,AAAA'
+        iterations = max(1, options['iterations'])
+
+        for label, builder in (('standard (1-4, 6)', html_templates.build_standard_html),
+                               ('template 5', html_templates.build_template5_html)):
+            builder(biodata, border, profile, personal, family, habits)  # warm up
+            start = time.perf_counter()
+            for _ in range(iterations):
+                html = builder(biodata, border, profile, personal, family, habits)
+            per_record_us = (time.perf_counter() - start) / iterations * 1e6
+            self.stdout.write(f"{label:<18} {per_record_us:8.1f} us/record  ({len(html):,} chars)")
@@ -0,0 +1,113 @@
+"""
+Compare per-message SMTP connections with the reused connection in biodata.mail.
+
+    python manage.py bench_smtp --messages 200 --handshake-ms 150
+
+Starts a local stand-in SMTP server (no mail leaves the machine) that waits
+``--handshake-ms`` before greeting each new connection, standing in for the
+TCP + STARTTLS + AUTH cost of a real provider, and ``--latency-ms`` per
+command round trip. Every ``--drop-every`` messages it hangs up, which
+exercises the Mailer's reconnect path. Prints messages per second for
+``EmailMessage.send()`` and for ``Mailer``.
+"""
+import socketserver
+import threading
+import time
+
+from django.core.mail import EmailMessage, get_connection
+from django.core.management.base import BaseCommand
+
+from biodata.mail import Mailer
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        server = self.server
+        time.sleep(server.handshake)
+        self._reply('220 bench-smtp ready')
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            time.sleep(server.latency)
+            command = line.decode('ascii', 'replace').strip().upper()
+            if command.startswith(('EHLO', 'HELO')):
+                self._reply('250-bench-smtp', '250 8BITMIME')
+            elif command.startswith(('MAIL', 'RCPT', 'RSET', 'NOOP')):
+                self._reply('250 OK')
+            elif command == 'DATA':
+                self._reply('354 End data with <CR><LF>.<CR><LF>')
+                while self.rfile.readline() not in (b'.\r\n', b'.\n', b''):
+                    pass
+                with server.lock:
+                    server.accepted += 1
+                    drop = server.drop_every and server.accepted % server.drop_every == 0
+                self._reply('250 OK queued')
+                if drop:
+                    return  # hang up without QUIT, like an idle-timeout disconnect
+            elif command == 'QUIT':
+                self._reply('221 Bye')
+                return
+            else:
+                self._reply('502 Command not implemented')
+
+    def _reply(self, *lines):
+        self.wfile.write(''.join(f'{line}\r\n' for line in lines).encode('ascii'))
+
+
+class _SMTPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, handshake, latency, drop_every):
+        super().__init__(('127.0.0.1', 0), _SMTPHandler)
+        self.handshake = handshake
+        self.latency = latency
+        self.drop_every = drop_every
+        self.accepted = 0
+        self.lock = threading.Lock()
+
+
+class Command(BaseCommand):
+    help = 'Benchmark SMTP delivery: new connection per message vs. one reused connection'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--messages', type=int, default=100)
+        parser.add_argument('--handshake-ms', type=float, default=150.0, help='Delay before each connection greeting')
+        parser.add_argument('--latency-ms', type=float, default=2.0, help='Delay per SMTP command')
+        parser.add_argument('--drop-every', type=int, default=50, help='Server hangs up after every N messages (0 = never)')
+
+    def handle(self, *args, **options):
+        server = _SMTPServer(options['handshake_ms'] / 1000, options['latency_ms'] / 1000, options['drop_every'])
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        host, port = server.server_address
+        self.stdout.write(f"Stand-in SMTP server on {host}:{port}")
+
+        def connection():
+            return get_connection('django.core.mail.backends.smtp.EmailBackend', host=host, port=port,
+                                  username='', password='', use_tls=False, use_ssl=False, timeout=10)
+
+        def messages():
+            for i in range(options['messages']):
+                yield EmailMessage(subject=f"Bench {i}", body="x" * 2000, from_email='bench@example.com',
+                                   to=[f'user{i}@example.com'])
+
+        try:
+            start = time.perf_counter()
+            for message in messages():
+                message.connection = connection()
+                message.send(fail_silently=False)
+            self._report('EmailMessage.send()', options['messages'], time.perf_counter() - start, 0)
+
+            start = time.perf_counter()
+            with Mailer(connection=connection(), backoff=0.05) as mailer:
+                failed = [m for m, error in mailer.send_messages(messages()) if error]
+            self._report('Mailer (reused)', options['messages'] - len(failed),
+                         time.perf_counter() - start, mailer.reconnects)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def _report(self, label, sent, elapsed, reconnects):
+        self.stdout.write(f"{label:<22} {sent:>5} sent in {elapsed:6.2f}s  {sent / elapsed:7.1f} msg/s  "
+                          f"reconnects {reconnects}")
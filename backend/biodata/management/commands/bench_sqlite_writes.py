@@ -0,0 +1,110 @@
+"""
+Multi-threaded write benchmark for the SQLite profile in biodata/sqlite.py.
+
+    python manage.py bench_sqlite_writes --threads 8 --writes 100 --readers 2
+
+Runs the same workload twice against fresh temporary databases: once with
+SQLite's defaults (rollback journal) and once with SQLITE_PRAGMAS applied.
+Each writer inserts a biodata (like a form submission) and then updates it
+(like a screenshot upload) while reader threads keep listing records.
+Reports throughput, latency and "database is locked" failures.
+"""
+import os
+import shutil
+import statistics
+import tempfile
+import threading
+import time
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connections
+from django.test.utils import override_settings
+
+from biodata.management.commands.bench_html_build import SAMPLE_DATA
+from biodata.models import Biodata
+
+
+
+class Command(BaseCommand):
+    help = 'Compare concurrent write throughput with and without the SQLite concurrent-writer profile'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=8, help='Writer threads')
+        parser.add_argument('--writes', type=int, default=100, help='Insert+update pairs per writer')
+        parser.add_argument('--readers', type=int, default=2, help='Reader threads listing records meanwhile')
+
+    def handle(self, *args, **options):
+        for label, enabled in (('default', False), ('concurrent profile', True)):
+            result = self._run(enabled, options)
+            latencies = sorted(result['latencies']) or [0.0]
+            p95 = latencies[int(len(latencies) * 0.95) - 1] if len(latencies) > 1 else latencies[0]
+            self.stdout.write(
+                f"{label:<20} {result['ok']:>6} writes in {result['elapsed']:6.2f}s "
+                f"({result['ok'] / result['elapsed']:8.1f}/s)  "
+                f"median {statistics.median(latencies) * 1000:6.1f} ms  p95 {p95 * 1000:7.1f} ms  "
+                f"locked errors {result['locked']:>4}  reads {result['reads']}"
+            )
+
+    def _run(self, enabled, options):
+        tmp = tempfile.mkdtemp(prefix='bench-sqlite-')
+        alias = 'bench_wal' if enabled else 'bench_default'
+        connections.settings[alias] = dict(connections.settings['default'], NAME=os.path.join(tmp, 'bench.sqlite3'))
+        result = {'ok': 0, 'locked': 0, 'reads': 0, 'latencies': []}
+        lock = threading.Lock()
+        done = threading.Event()
+
+        def writer(index):
+            try:
+                for i in range(options['writes']):
+                    start = time.perf_counter()
+                    try:
+                        obj = Biodata.objects.using(alias).create(
+                            title=f'bench {index}-{i}', data=SAMPLE_DATA, template_choice='1',
+                            user_email=f'user{index}@example.com')
+                        Biodata.objects.using(alias).filter(pk=obj.pk).update(payment_screenshot=f'payments/{obj.pk}.png')
+                    except OperationalError as exc:
+                        if 'locked' not in str(exc):
+                            raise
+                        with lock:
+                            result['locked'] += 1
+                        continue
+                    with lock:
+                        result['ok'] += 1
+                        result['latencies'].append(time.perf_counter() - start)
+            finally:
+                connections[alias].close()
+
+        def reader():
+            try:
+                while not done.is_set():
+                    try:
+                        list(Biodata.objects.using(alias).order_by('-created_at', '-id')[:20])
+                        with lock:
+                            result['reads'] += 1
+                    except OperationalError:
+                        pass
+            finally:
+                connections[alias].close()
+
+        try:
+            with override_settings(SQLITE_CONCURRENT_WRITES=enabled):
+                call_command('migrate', database=alias, verbosity=0)
+                connections[alias].close()
+                readers = [threading.Thread(target=reader) for _ in range(options['readers'])]
+                writers = [threading.Thread(target=writer, args=(n,)) for n in range(options['threads'])]
+                start = time.perf_counter()
+                for thread in readers + writers:
+                    thread.start()
+                for thread in writers:
+                    thread.join()
+                result['elapsed'] = time.perf_counter() - start
+                done.set()
+                for thread in readers:
+                    thread.join()
+        finally:
+            connections[alias].close()
+            del connections[alias]
+            del connections.settings[alias]
+            shutil.rmtree(tmp, ignore_errors=True)
+        return result
@@ -0,0 +1,41 @@
+"""
+Fail if a hot Biodata query is planned as a full table scan or does not
+use the index meant for it.
+
+    python manage.py check_query_plans [--verbose]
+
+Meant for CI after migrations: exits non-zero listing the offending
+queries and their EXPLAIN QUERY PLAN output.
+"""
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from biodata.query_plans import explain, hot_queries, plan_problems
+
+
+class Command(BaseCommand):
+    help = 'Run EXPLAIN QUERY PLAN on the hot Biodata queries and fail on full table scans'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default='default')
+        parser.add_argument('--verbose', action='store_true', help='Print every plan, not only failures')
+
+    def handle(self, *args, **options):
+        using = options['database']
+        if connections[using].vendor != 'sqlite':
+            raise CommandError("check_query_plans understands SQLite plans only")
+
+        if options['verbose']:
+            for name, (queryset, index) in hot_queries().items():
+                self.stdout.write(f"{name} (expects {index})")
+                for line in explain(queryset, using):
+                    self.stdout.write(f"    {line}")
+
+        offenders = plan_problems(using)
+        if offenders:
+            for name, (problems, plan) in offenders.items():
+                self.stderr.write(f"{name}: {'; '.join(problems)}")
+                for line in plan:
+                    self.stderr.write(f"    {line}")
+            raise CommandError(f"{len(offenders)} hot queries are not served by their index")
+        self.stdout.write(self.style.SUCCESS(f"All {len(hot_queries())} hot queries use their index"))
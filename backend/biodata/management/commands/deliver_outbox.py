@@ -0,0 +1,53 @@
+"""
+Send queued outbox emails (approval PDFs, uploaded PDFs).
+
+    python manage.py deliver_outbox            # poll forever
+    python manage.py deliver_outbox --once     # send what is due (within the rate limit) and exit
+
+Messages go out over one SMTP connection, at most
+OUTBOX_RATE_LIMIT_PER_MINUTE per minute across all outbox workers; failures
+are rescheduled with exponential backoff (see biodata/outbox.py).
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from biodata.mail import Mailer
+from biodata.outbox import claim_messages, deliver, rate_limit_remaining, requeue_stale_messages
+
+
+class Command(BaseCommand):
+    help = 'Deliver pending OutboxMessages with rate limiting and retries'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Exit when nothing is due')
+        parser.add_argument('--sleep', type=float, default=5.0, help='Seconds to wait when nothing is due')
+        parser.add_argument('--batch', type=int, default=10, help='Messages claimed per poll')
+
+    def handle(self, *args, **options):
+        sent = failed = 0
+        started = time.monotonic()
+        # Reconnect once on a dropped session; the outbox handles longer backoff
+        mailer = Mailer(retries=1)
+        try:
+            while True:
+                requeue_stale_messages()
+                remaining = rate_limit_remaining()
+                limit = options['batch'] if remaining is None else min(options['batch'], remaining)
+                messages = claim_messages(limit) if limit else []
+                if not messages:
+                    mailer.close()  # don't hold an idle SMTP session while waiting
+                    if options['once']:
+                        break
+                    time.sleep(options['sleep'])
+                    continue
+                for message in messages:
+                    if deliver(message, mailer):
+                        sent += 1
+                        self.stdout.write(self.style.SUCCESS(f"Sent outbox message {message.pk} to {', '.join(message.to)}"))
+                    else:
+                        failed += 1
+                        self.stderr.write(f"Outbox message {message.pk} {message.status}: {message.last_error}")
+        finally:
+            mailer.close()
+        self.stdout.write(f"Delivered {sent} messages ({failed} failures) in {time.monotonic() - started:.1f}s")
@@ -0,0 +1,119 @@
+"""
+Dump the Biodata table to gzip-compressed JSON Lines.
+
+    python manage.py export_biodata --output exports/biodata
+    python manage.py export_biodata --output exports/biodata --shard-size 100000
+    python manage.py export_biodata --output exports/biodata --checkpoint exports/biodata.ckpt
+
+Rows are read in id order with keyset pagination (``id > last_id``), so
+every batch costs the same however far the export has got. Each batch is
+appended to the current shard (``<output>-00001.jsonl.gz``, ...) as its
+own gzip member, after which the checkpoint records the last id and the
+shard size. Re-running with the same checkpoint truncates any partially
+written batch and continues after the last exported id.
+"""
+import glob
+import gzip
+import json
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.core.serializers.json import DjangoJSONEncoder
+
+from biodata.models import Biodata
+
+EXPORT_FIELDS = (
+    'id', 'title', 'data', 'profile_image', 'payment_screenshot', 'template_choice',
+    'user_name', 'user_email', 'user_phone', 'is_approved', 'download_link',
+    'created_at', 'updated_at',
+)
+
+
+class Command(BaseCommand):
+    help = 'Export all biodata to (optionally sharded) gzip JSONL with a resumable checkpoint'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', required=True, help='Path prefix; shards are <output>-NNNNN.jsonl.gz')
+        parser.add_argument('--shard-size', type=int, default=0, help='Rows per shard (0 = one file)')
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--checkpoint', default=None, help='Checkpoint file (default: <output>.checkpoint.json)')
+        parser.add_argument('--restart', action='store_true', help='Ignore an existing checkpoint and start over')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1 or options['shard_size'] < 0:
+            raise CommandError("--batch-size must be positive and --shard-size not negative")
+        output = options['output']
+        checkpoint_path = options['checkpoint'] or f"{output}.checkpoint.json"
+        os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+
+        state = {'last_id': 0, 'shard': 1, 'shard_rows': 0, 'shard_bytes': 0, 'rows': 0, 'done': False}
+        if os.path.exists(checkpoint_path) and not options['restart']:
+            with open(checkpoint_path, encoding='utf-8') as f:
+                state.update(json.load(f))
+            if state['done']:
+                self.stdout.write(f"Export already complete ({state['rows']} rows); use --restart to redo it")
+                return
+            self.stdout.write(f"Resuming after id {state['last_id']} ({state['rows']} rows exported)")
+        else:
+            for stale in glob.glob(f"{glob.escape(output)}-[0-9][0-9][0-9][0-9][0-9].jsonl.gz"):
+                os.unlink(stale)
+
+        start = time.perf_counter()
+        exported = 0
+        last_report = start
+        while True:
+            batch = list(
+                Biodata.objects.filter(id__gt=state['last_id']).order_by('id')
+                .values(*EXPORT_FIELDS)[:options['batch_size']]
+            )
+            if not batch:
+                break
+            while batch:
+                if options['shard_size'] and state['shard_rows'] >= options['shard_size']:
+                    state.update(shard=state['shard'] + 1, shard_rows=0, shard_bytes=0)
+                room = options['shard_size'] - state['shard_rows'] if options['shard_size'] else len(batch)
+                chunk, batch = batch[:room], batch[room:]
+                state['shard_bytes'] = self._append(self._shard_path(output, state['shard']), chunk, state['shard_bytes'])
+                state['shard_rows'] += len(chunk)
+                state['rows'] += len(chunk)
+                state['last_id'] = chunk[-1]['id']
+                exported += len(chunk)
+                self._save_checkpoint(checkpoint_path, state)
+
+            now = time.perf_counter()
+            if now - last_report >= 5:
+                self.stdout.write(f"{state['rows']} rows, {exported / (now - start):.0f} rows/s")
+                last_report = now
+
+        state['done'] = True
+        self._save_checkpoint(checkpoint_path, state)
+        elapsed = time.perf_counter() - start
+        rate = exported / elapsed if elapsed else 0
+        self.stdout.write(self.style.SUCCESS(
+            f"Exported {exported} rows this run ({state['rows']} total) into {state['shard']} shard(s) "
+            f"in {elapsed:.1f}s, {rate:.0f} rows/s"
+        ))
+
+    def _shard_path(self, output, shard):
+        return f"{output}-{shard:05d}.jsonl.gz"
+
+    def _append(self, path, rows, offset):
+        """Write ``rows`` as one gzip member at ``offset``; returns the new file size.
+
+        Anything past ``offset`` was written after the last checkpoint by an
+        interrupted run and is discarded.
+        """
+        payload = ''.join(json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False) + '\n' for row in rows)
+        with open(path, 'ab') as f:
+            f.truncate(offset)
+            f.write(gzip.compress(payload.encode('utf-8'), compresslevel=6))
+            f.flush()
+            os.fsync(f.fileno())
+            return f.tell()
+
+    def _save_checkpoint(self, path, state):
+        tmp = f"{path}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(tmp, path)
@@ -0,0 +1,105 @@
+"""
+Build print-resolution variants of the template border images.
+
+    python manage.py optimize_borders            # A4 at 150 DPI
+    python manage.py optimize_borders --dpi 200 --quality 82
+
+Each border in assets/border/ is downscaled to fit A4 at the chosen DPI,
+keeping its aspect ratio (the templates stretch it to the page anyway),
+re-encoded and written as
+``<name>.<dpi>dpi.<hash>.<ext>`` next to a ``manifest.json`` in
+settings.BORDER_PRINT_DIR. biodata.assets picks the variants up from the
+manifest for every render path.
+"""
+import hashlib
+import io
+import json
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from biodata.assets import BORDER_IMAGES, DEFAULT_BORDER_IMAGE, MANIFEST_NAME, border_print_dir
+
+A4_MM = (210, 297)
+
+
+class Command(BaseCommand):
+    help = 'Create print-optimized (A4 at a given DPI) border images and a manifest'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dpi', type=int, default=150)
+        parser.add_argument('--quality', type=int, default=85, help='JPEG quality')
+        parser.add_argument('--all', action='store_true', help='Process every image in assets/border, not only mapped ones')
+
+    def handle(self, *args, **options):
+        try:
+            from PIL import Image
+        except ImportError:
+            raise CommandError("Pillow is required (pip install Pillow)")
+
+        dpi = options['dpi']
+        source_dir = os.path.join(settings.BASE_DIR.parent, 'assets', 'border')
+        out_dir = border_print_dir()
+        os.makedirs(out_dir, exist_ok=True)
+        target = tuple(round(mm / 25.4 * dpi) for mm in A4_MM)
+
+        if options['all']:
+            names = sorted(n for n in os.listdir(source_dir) if os.path.isfile(os.path.join(source_dir, n)))
+        else:
+            names = sorted(set(BORDER_IMAGES.values()) | {DEFAULT_BORDER_IMAGE})
+
+        manifest = {'dpi': dpi, 'page': 'A4', 'borders': {}}
+        keep = {MANIFEST_NAME}
+        for name in names:
+            source = os.path.join(source_dir, name)
+            if not os.path.exists(source):
+                self.stderr.write(f"Skipping missing {name}")
+                continue
+            with Image.open(source) as img:
+                source_size = img.size
+                img = img.convert('RGB')
+                # Only ever downscale, keeping the aspect ratio, to fit inside A4
+                img.thumbnail(target, Image.LANCZOS)
+                data, ext = self._encode(img, options['quality'])
+                size = img.size
+
+            source_bytes = os.path.getsize(source)
+            if len(data) >= source_bytes:
+                # Re-encoding didn't help; ship the original bytes under a versioned name
+                with open(source, 'rb') as f:
+                    data = f.read()
+                ext = os.path.splitext(name)[1].lstrip('.').lower()
+                size = source_size
+            digest = hashlib.sha256(data).hexdigest()[:10]
+            filename = f"{os.path.splitext(name)[0]}.{dpi}dpi.{digest}.{ext}"
+            with open(os.path.join(out_dir, filename), 'wb') as f:
+                f.write(data)
+            keep.add(filename)
+            manifest['borders'][name] = {
+                'file': filename,
+                'width': size[0],
+                'height': size[1],
+                'bytes': len(data),
+                'source_bytes': source_bytes,
+            }
+            self.stdout.write(f"{name:<12} {source_bytes:>10,} -> {len(data):>9,} bytes  {filename}")
+
+        with open(os.path.join(out_dir, MANIFEST_NAME), 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+
+        # Remove variants from earlier runs that the manifest no longer references
+        for stale in set(os.listdir(out_dir)) - keep:
+            os.unlink(os.path.join(out_dir, stale))
+        self.stdout.write(self.style.SUCCESS(f"Wrote {len(manifest['borders'])} borders to {out_dir}"))
+
+    def _encode(self, img, quality):
+        """Return the smaller of an optimized PNG and a progressive JPEG."""
+        candidates = []
+        buf = io.BytesIO()
+        img.save(buf, 'JPEG', quality=quality, optimize=True, progressive=True)
+        candidates.append((buf.getvalue(), 'jpg'))
+        buf = io.BytesIO()
+        img.save(buf, 'PNG', optimize=True)
+        candidates.append((buf.getvalue(), 'png'))
+        return min(candidates, key=lambda c: len(c[0]))
@@ -0,0 +1,25 @@
+"""
+Rebuild the FTS5 search table from the Biodata rows.
+
+    python manage.py rebuild_search_index
+
+Only needed after bulk changes that bypass save() (queryset.update(),
+raw SQL, restored backups); normal saves and deletes keep it current.
+"""
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from biodata import search
+from biodata.models import Biodata
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the full-text search index over all biodata'
+
+    def handle(self, *args, **options):
+        if not search.is_available():
+            raise CommandError("Full-text search needs the SQLite database backend")
+        start = time.perf_counter()
+        count = search.rebuild_index(Biodata.objects.all())
+        self.stdout.write(self.style.SUCCESS(f"Indexed {count} biodata in {time.perf_counter() - start:.2f}s"))
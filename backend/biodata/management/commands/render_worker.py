@@ -0,0 +1,77 @@
+"""
+Process queued PDF render jobs created by the admin approve action.
+
+    python manage.py render_worker                   # poll forever, one render at a time
+    python manage.py render_worker --once            # drain the queue and exit
+    python manage.py render_worker --concurrency 0   # render on all cores (bounded by RAM)
+
+Each rendered job queues its email in the outbox; run
+``manage.py deliver_outbox`` to send them.
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from biodata.assets import start_border_prewarm
+from biodata.jobs import (
+    claim_jobs, create_render_executor, default_worker_name, process_job,
+    process_jobs_parallel, render_concurrency, requeue_stale_jobs,
+)
+
+
+class Command(BaseCommand):
+    help = 'Claim queued RenderJobs, render their PDFs and queue the approval emails'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Exit when the queue is empty')
+        parser.add_argument('--sleep', type=float, default=2.0, help='Seconds to wait when the queue is empty')
+        parser.add_argument('--max-jobs', type=int, default=0, help='Stop after this many jobs (0 = no limit)')
+        parser.add_argument('--name', default=None, help='Worker name recorded on claimed jobs')
+        parser.add_argument(
+            '--concurrency', type=int, default=None,
+            help='Render processes to use (default settings.RENDER_CONCURRENCY); '
+                 '0 = auto (CPU count, limited by available memory)',
+        )
+
+    def handle(self, *args, **options):
+        worker = options['name'] or default_worker_name()
+        concurrency = render_concurrency(options['concurrency'])
+        executor = create_render_executor(concurrency) if concurrency > 1 else None
+        processed = 0
+        started = time.monotonic()
+        self.stdout.write(f"Render worker {worker} started with concurrency {concurrency}")
+        if executor is None:
+            start_border_prewarm()  # render processes prewarm in their initializer
+        try:
+            while True:
+                requeue_stale_jobs()
+                # Claim enough jobs to keep every render process busy
+                jobs = claim_jobs(worker, limit=concurrency * 2 if executor else 1)
+                if not jobs:
+                    if options['once']:
+                        break
+                    time.sleep(options['sleep'])
+                    continue
+                if executor:
+                    results = process_jobs_parallel(jobs, executor)
+                else:
+                    results = ((job, process_job(job)) for job in jobs)
+                for job, ok in results:
+                    processed += 1
+                    self._report(job, ok)
+                if options['max_jobs'] and processed >= options['max_jobs']:
+                    break
+        finally:
+            if executor:
+                executor.shutdown()
+        elapsed = time.monotonic() - started
+        self.stdout.write(f"Render worker {worker} processed {processed} jobs in {elapsed:.1f}s")
+
+    def _report(self, job, ok):
+        duration = job.duration.total_seconds() if job.duration else 0
+        if ok:
+            self.stdout.write(self.style.SUCCESS(
+                f"Job {job.pk} (biodata {job.biodata_id}) done in {duration:.1f}s"))
+        else:
+            self.stderr.write(self.style.ERROR(
+                f"Job {job.pk} (biodata {job.biodata_id}) {job.status}: {job.error}"))
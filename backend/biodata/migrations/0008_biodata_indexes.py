@@ -0,0 +1,34 @@
+# Generated by Django 4.2.30 on 2026-10-18 01:03
+
+from django.db import migrations, models
+import django.db.models.functions.text
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('biodata', '0007_renderjob'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='biodata',
+            index=models.Index(fields=['created_at', 'id'], name='biodata_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='biodata',
+            index=models.Index(django.db.models.functions.text.Lower('user_email'), models.F('created_at'), name='biodata_email_lower_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='biodata',
+            index=models.Index(condition=models.Q(('payment_screenshot__isnull', True)), fields=['created_at'], name='biodata_no_screenshot_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='biodata',
+            index=models.Index(condition=models.Q(('is_approved', False)), fields=['id'], name='biodata_pending_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='biodata',
+            index=models.Index(fields=['template_choice'], name='biodata_template_idx'),
+        ),
+    ]
@@ -0,0 +1,144 @@
+# Generated by Django 4.2.30 on 2026-10-18 01:06
+
+import datetime
+import re
+
+from django.db import migrations, models
+import django.db.models.functions.text
+
+
+# Frozen copy of biodata.profile_fields as of this migration, so later
+# changes to that module never alter what the backfill did
+PROFILE_FIELD_KEYS = {
+    'name': ('name', 'full_name'),
+    'birth_date': ('date_of_birth', 'dob', 'birth_date'),
+    'height_inches': ('height',),
+    'city': ('residency_city', 'city', 'current_city'),
+    'education': ('education', 'qualification'),
+    'occupation': ('occupation', 'profession'),
+}
+PROFILE_COLUMNS = tuple(PROFILE_FIELD_KEYS)
+TEXT_COLUMNS = ('name', 'city', 'education', 'occupation')
+HEIGHT_FT_IN_RE = re.compile(r"""^\s*(\d)\s*(?:'|ft|feet)\s*(?:(\d{1,2})\s*(?:"|''|in|inch|inches)?)?\s*$""", re.I)
+HEIGHT_CM_RE = re.compile(r'^\s*(\d{2,3}(?:\.\d+)?)\s*cm\s*$', re.I)
+DATE_FORMATS = ('%Y-%m-%d', '%d-%m-%Y', '%d/%m/%Y', '%d.%m.%Y')
+
+
+def _raw_value(section, keys):
+    for key in keys:
+        item = section.get(key)
+        value = item.get('value') if isinstance(item, dict) else item
+        if value not in (None, ''):
+            return str(value).strip()
+    return ''
+
+
+def _parse_birth_date(value):
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.datetime.strptime(value, fmt).date()
+        except (TypeError, ValueError):
+            continue
+    return None
+
+
+def _parse_height_inches(value):
+    match = HEIGHT_FT_IN_RE.match(value or '')
+    if match:
+        return int(match.group(1)) * 12 + int(match.group(2) or 0)
+    match = HEIGHT_CM_RE.match(value or '')
+    if match:
+        return round(float(match.group(1)) / 2.54)
+    return None
+
+
+def _extract_profile_fields(data, max_length=100):
+    section = data.get('PersonalDetails') if isinstance(data, dict) else None
+    if not isinstance(section, dict):
+        section = {}
+    values = {column: _raw_value(section, keys) for column, keys in PROFILE_FIELD_KEYS.items()}
+    for column in TEXT_COLUMNS:
+        values[column] = ' '.join(values[column].split())[:max_length]
+    values['birth_date'] = _parse_birth_date(values['birth_date'])
+    values['height_inches'] = _parse_height_inches(values['height_inches'])
+    return values
+
+
+def backfill_profile_fields(apps, schema_editor):
+    Biodata = apps.get_model('biodata', 'Biodata')
+    db = schema_editor.connection.alias
+    batch = []
+    for obj in Biodata.objects.using(db).only('id', 'data').iterator(chunk_size=500):
+        for column, value in _extract_profile_fields(obj.data).items():
+            setattr(obj, column, value)
+        batch.append(obj)
+        if len(batch) >= 500:
+            Biodata.objects.using(db).bulk_update(batch, PROFILE_COLUMNS)
+            batch = []
+    if batch:
+        Biodata.objects.using(db).bulk_update(batch, PROFILE_COLUMNS)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('biodata', '0008_biodata_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='biodata',
+            name='birth_date',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='biodata',
+            name='city',
+            field=models.CharField(blank=True, max_length=100),
+        ),
+        migrations.AddField(
+            model_name='biodata',
+            name='education',
+            field=models.CharField(blank=True, max_length=100),
+        ),
+        migrations.AddField(
+            model_name='biodata',
+            name='height_inches',
+            field=models.PositiveSmallIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='biodata',
+            name='name',
+            field=models.CharField(blank=True, max_length=100),
+        ),
+        migrations.AddField(
+            model_name='biodata',
+            name='occupation',
+            field=models.CharField(blank=True, max_length=100),
+        ),
+        migrations.AddIndex(
+            model_name='biodata',
+            index=models.Index(django.db.models.functions.text.Lower('name'), name='biodata_name_lower_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='biodata',
+            index=models.Index(django.db.models.functions.text.Lower('city'), name='biodata_city_lower_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='biodata',
+            index=models.Index(django.db.models.functions.text.Lower('education'), name='biodata_education_lower_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='biodata',
+            index=models.Index(django.db.models.functions.text.Lower('occupation'), name='biodata_occupation_lower_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='biodata',
+            index=models.Index(fields=['birth_date'], name='biodata_birth_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='biodata',
+            index=models.Index(fields=['height_inches'], name='biodata_height_idx'),
+        ),
+        migrations.RunPython(backfill_profile_fields, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,83 @@
+# FTS5 shadow table for full-text search (see biodata/search.py)
+
+from django.db import DatabaseError, migrations
+
+# Frozen copy of the biodata.search DDL and indexing as of this migration
+TABLE = 'biodata_search'
+COLUMNS = ('title', 'user_name', 'user_email', 'user_phone', 'content')
+CREATE_SQL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {TABLE} USING fts5("
+    f"{', '.join(COLUMNS)}, tokenize = 'unicode61 remove_diacritics 2')"
+)
+DROP_SQL = f"DROP TABLE IF EXISTS {TABLE}"
+INSERT_SQL = f"INSERT INTO {TABLE} (rowid, {', '.join(COLUMNS)}) VALUES (%s, %s, %s, %s, %s, %s)"
+
+
+def _has_fts5(conn):
+    if conn.vendor != 'sqlite':
+        return False
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("CREATE VIRTUAL TABLE temp.biodata_fts5_probe USING fts5(a)")
+            cursor.execute("DROP TABLE temp.biodata_fts5_probe")
+    except DatabaseError:
+        return False
+    return True
+
+
+def _flatten(value, out):
+    if isinstance(value, dict):
+        if 'value' in value:
+            _flatten(value['value'], out)
+        else:
+            for item in value.values():
+                _flatten(item, out)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            _flatten(item, out)
+    elif value not in (None, ''):
+        out.append(str(value))
+
+
+def _document_row(obj):
+    values = []
+    _flatten(obj.data or {}, values)
+    return [obj.pk, obj.title or '', obj.user_name or '', obj.user_email or '',
+            obj.user_phone or '', '\n'.join(values)]
+
+
+def create_search_index(apps, schema_editor):
+    conn = schema_editor.connection
+    if not _has_fts5(conn):
+        return
+    Biodata = apps.get_model('biodata', 'Biodata')
+    with conn.cursor() as cursor:
+        cursor.execute(CREATE_SQL)
+        rows = []
+        queryset = Biodata.objects.using(conn.alias).only(
+            'id', 'title', 'user_name', 'user_email', 'user_phone', 'data')
+        for obj in queryset.iterator(chunk_size=500):
+            rows.append(_document_row(obj))
+            if len(rows) >= 500:
+                cursor.executemany(INSERT_SQL, rows)
+                rows = []
+        if rows:
+            cursor.executemany(INSERT_SQL, rows)
+
+
+def drop_search_index(apps, schema_editor):
+    conn = schema_editor.connection
+    if conn.vendor == 'sqlite':
+        with conn.cursor() as cursor:
+            cursor.execute(DROP_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('biodata', '0009_biodata_profile_fields'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 4.2.30 on 2026-10-18 01:26
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('biodata', '0011_outboxmessage'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='renderjob',
+            name='run_after',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+    ]
@@ -1,7 +1,21 @@
 from django.db import models
+from django.utils import timezone
+from django.db.models.functions import Lower
 
 
 
+class BiodataQuerySet(models.QuerySet):
+    def for_email(self, email):
+        """Case-insensitive email match that can use the LOWER(user_email) index.
+
+        ``user_email__iexact`` compiles to LIKE on SQLite, which no index serves.
+        """
+        return self.alias(user_email_lower=Lower('user_email')).filter(user_email_lower=(email or '').lower())
+
+    def without_payment_screenshot(self):
+        return self.filter(payment_screenshot__isnull=True)
+
+
 class Biodata(models.Model):
     title = models.CharField(max_length=255, blank=True)
     data = models.JSONField(default=dict, blank=True)
@@ -16,6 +30,150 @@ class Biodata(models.Model):
     download_link = models.URLField(blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Copies of PersonalDetails values for filtering, kept in sync by save()
+    # (see biodata/profile_fields.py); `data` stays the source of truth.
+    name = models.CharField(max_length=100, blank=True)
+    birth_date = models.DateField(null=True, blank=True)
+    height_inches = models.PositiveSmallIntegerField(null=True, blank=True)
+    city = models.CharField(max_length=100, blank=True)
+    education = models.CharField(max_length=100, blank=True)
+    occupation = models.CharField(max_length=100, blank=True)
+
+    objects = BiodataQuerySet.as_manager()
+
+    class Meta:
+        # Each index backs a hot query; `manage.py check_query_plans` verifies
+        # none of them falls back to a full table scan.
+        indexes = [
+            # API list (cursor on created_at, id)
+            models.Index(fields=['created_at', 'id'], name='biodata_created_id_idx'),
+            # payment_verify_view: latest record for the user's email
+            models.Index(Lower('user_email'), 'created_at', name='biodata_email_lower_idx'),
+            # payment_verify_view fallback: latest record without a screenshot
+            models.Index(fields=['created_at'], condition=models.Q(payment_screenshot__isnull=True),
+                         name='biodata_no_screenshot_idx'),
+            # Admin "pending approval" filter (Django emits WHERE NOT is_approved,
+            # which only a partial index can serve); SQLite appends the rowid to
+            # the template index, so its ORDER BY -pk needs no sort either.
+            models.Index(fields=['id'], condition=models.Q(is_approved=False), name='biodata_pending_idx'),
+            models.Index(fields=['template_choice'], name='biodata_template_idx'),
+            # API profile filters (case-insensitive, see profile_fields.apply_profile_filters)
+            models.Index(Lower('name'), name='biodata_name_lower_idx'),
+            models.Index(Lower('city'), name='biodata_city_lower_idx'),
+            models.Index(Lower('education'), name='biodata_education_lower_idx'),
+            models.Index(Lower('occupation'), name='biodata_occupation_lower_idx'),
+            models.Index(fields=['birth_date'], name='biodata_birth_date_idx'),
+            models.Index(fields=['height_inches'], name='biodata_height_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        from .profile_fields import PROFILE_COLUMNS, extract_profile_fields
+        for column, value in extract_profile_fields(self.data).items():
+            setattr(self, column, value)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'data' in update_fields:
+            kwargs['update_fields'] = set(update_fields) | set(PROFILE_COLUMNS)
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return f"Biodata {self.pk} - {self.title or self.user_name or self.created_at.isoformat()}"
+
+
+class RenderJob(models.Model):
+    """A queued PDF render + email delivery for an approved Biodata.
+
+    Jobs are enqueued by the admin approve action and processed by
+    ``manage.py render_worker``.
+    """
+    STATUS_QUEUED = 'queued'
+    STATUS_RUNNING = 'running'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_QUEUED, 'Queued'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_DONE, 'Done'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    biodata = models.ForeignKey(Biodata, on_delete=models.CASCADE, related_name='render_jobs')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_QUEUED, db_index=True)
+    # Extra flags for the worker, e.g. {"debug_email": "plain"}
+    options = models.JSONField(default=dict, blank=True)
+    attempts = models.PositiveIntegerField(default=0)
+    # Not claimed before this time; pushed back after each failed attempt
+    run_after = models.DateTimeField(default=timezone.now)
+    worker = models.CharField(max_length=100, blank=True)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ('-created_at',)
+
+    @property
+    def duration(self):
+        if self.started_at and self.finished_at:
+            return self.finished_at - self.started_at
+        return None
+
+    def __str__(self):
+        return f"RenderJob {self.pk} for Biodata {self.biodata_id} ({self.status})"
+
+
+def outbox_storage():
+    """Private storage for outbox attachments (not under MEDIA_ROOT)."""
+    from django.conf import settings
+    from django.core.files.storage import FileSystemStorage
+    return FileSystemStorage(location=settings.OUTBOX_DIR)
+
+
+class OutboxMessage(models.Model):
+    """An email waiting for ``manage.py deliver_outbox``.
+
+    Request handlers and the render worker only insert rows here (see
+    ``biodata.outbox.queue_email``); delivery, rate limiting and retries
+    happen in the outbox worker. The attachment is either a spooled file or
+    a Biodata whose PDF is taken from the PDF cache at send time. 'held'
+    messages wait for their biodata to be approved (``release_held_messages``).
+    """
+    STATUS_HELD = 'held'
+    STATUS_PENDING = 'pending'
+    STATUS_SENDING = 'sending'
+    STATUS_SENT = 'sent'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_HELD, 'Held until approval'),
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_SENDING, 'Sending'),
+        (STATUS_SENT, 'Sent'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    # Same key within OUTBOX_DEDUPE_WINDOW = same email (double clicks, job retries)
+    dedupe_key = models.CharField(max_length=200, blank=True, db_index=True)
+    to = models.JSONField(default=list)
+    from_email = models.CharField(max_length=254, blank=True)
+    subject = models.CharField(max_length=255)
+    body = models.TextField(blank=True)
+    attachment = models.FileField(upload_to='attachments/', storage=outbox_storage, null=True, blank=True)
+    attachment_name = models.CharField(max_length=255, blank=True)
+    attachment_biodata = models.ForeignKey(Biodata, null=True, blank=True, on_delete=models.SET_NULL,
+                                           related_name='outbox_messages')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True, db_index=True)
+
+    class Meta:
+        ordering = ('-created_at',)
+        indexes = [
+            # Worker poll: due pending messages, oldest first
+            models.Index(fields=['status', 'next_attempt_at'], name='outbox_due_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} -> {', '.join(self.to)} ({self.status})"
@@ -0,0 +1,169 @@
+"""Persistent email outbox.
+
+Anything that wants to send mail calls ``queue_email`` and returns; the
+``deliver_outbox`` command claims due messages, sends them over one SMTP
+connection (``biodata.mail.Mailer``) within OUTBOX_RATE_LIMIT_PER_MINUTE,
+and records the outcome. Failed sends, and failed renders of an attached
+biodata PDF, are retried with exponential backoff until OUTBOX_MAX_ATTEMPTS;
+permanent SMTP errors fail immediately.
+"""
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .mail import is_transient
+from .models import OutboxMessage
+
+logger = logging.getLogger(__name__)
+
+
+class AttachmentRenderError(Exception):
+    """The biodata PDF for a message could not be rendered (retryable)."""
+
+
+def queue_email(to, subject, body, *, from_email=None, attachment=None, attachment_name='',
+                attachment_biodata=None, dedupe_key='', hold=False):
+    """Store an email for delivery and return the ``OutboxMessage``.
+
+    ``attachment`` is a Django ``File`` (copied into the outbox storage);
+    ``attachment_biodata`` attaches that record's PDF at send time instead.
+    A message with the same ``dedupe_key`` queued within
+    OUTBOX_DEDUPE_WINDOW seconds is returned instead of a new one. With
+    ``hold`` the message is not sent until ``release_held_messages``.
+    """
+    if dedupe_key:
+        window = getattr(settings, 'OUTBOX_DEDUPE_WINDOW', 3600)
+        existing = (
+            OutboxMessage.objects.filter(dedupe_key=dedupe_key, created_at__gte=timezone.now() - timedelta(seconds=window))
+            .exclude(status=OutboxMessage.STATUS_FAILED)
+            .first()
+        )
+        if existing is not None:
+            if attachment is not None:
+                attachment.close()
+            return existing
+    message = OutboxMessage(
+        dedupe_key=dedupe_key,
+        to=[to] if isinstance(to, str) else list(to),
+        from_email=from_email or getattr(settings, 'DEFAULT_FROM_EMAIL', 'noreply@yourdomain.com'),
+        subject=subject,
+        body=body,
+        attachment_name=attachment_name,
+        attachment_biodata=attachment_biodata,
+        status=OutboxMessage.STATUS_HELD if hold else OutboxMessage.STATUS_PENDING,
+    )
+    if attachment is not None:
+        # Streams the file in chunks into the outbox storage
+        message.attachment.save(attachment_name or 'attachment', attachment, save=False)
+    message.save()
+    return message
+
+
+def release_held_messages(biodata):
+    """Queue the messages held until ``biodata`` was approved; returns them."""
+    held = list(OutboxMessage.objects.filter(attachment_biodata=biodata, status=OutboxMessage.STATUS_HELD))
+    OutboxMessage.objects.filter(pk__in=[m.pk for m in held], status=OutboxMessage.STATUS_HELD).update(
+        status=OutboxMessage.STATUS_PENDING, next_attempt_at=timezone.now())
+    return held
+
+
+def rate_limit_remaining(now=None):
+    """How many messages may still be sent in the current minute (all workers).
+
+    Messages other workers have claimed but not finished count too, so
+    concurrent ``deliver_outbox`` runs share the limit.
+    """
+    limit = getattr(settings, 'OUTBOX_RATE_LIMIT_PER_MINUTE', 20)
+    if not limit:
+        return None
+    now = now or timezone.now()
+    used = OutboxMessage.objects.filter(
+        Q(sent_at__gt=now - timedelta(minutes=1)) | Q(status=OutboxMessage.STATUS_SENDING)
+    ).count()
+    return max(0, limit - used)
+
+
+def requeue_stale_messages():
+    """Return messages left 'sending' by a crashed worker to the queue."""
+    cutoff = timezone.now() - timedelta(minutes=15)
+    return OutboxMessage.objects.filter(status=OutboxMessage.STATUS_SENDING, next_attempt_at__lt=cutoff).update(
+        status=OutboxMessage.STATUS_PENDING)
+
+
+def claim_messages(limit):
+    """Atomically move up to ``limit`` due messages to 'sending' (conditional UPDATE)."""
+    now = timezone.now()
+    claimed = []
+    candidates = (
+        OutboxMessage.objects.filter(status=OutboxMessage.STATUS_PENDING, next_attempt_at__lte=now)
+        .order_by('next_attempt_at')
+        .values_list('pk', flat=True)[: limit * 4]
+    )
+    for pk in candidates:
+        updated = OutboxMessage.objects.filter(pk=pk, status=OutboxMessage.STATUS_PENDING).update(
+            status=OutboxMessage.STATUS_SENDING, attempts=F('attempts') + 1, next_attempt_at=now,
+        )
+        if updated:
+            claimed.append(OutboxMessage.objects.select_related('attachment_biodata').get(pk=pk))
+            if len(claimed) >= limit:
+                break
+    return claimed
+
+
+def build_email(message):
+    email = EmailMessage(subject=message.subject, body=message.body,
+                         from_email=message.from_email or None, to=message.to)
+    if message.attachment:
+        with message.attachment.open('rb') as f:
+            email.attach(message.attachment_name or 'attachment', f.read(), 'application/pdf')
+    elif message.attachment_biodata_id:
+        from .rendering import render_biodata_pdf
+        try:
+            # Served from the PDF cache when the approval render job made it
+            pdf_bytes, _hit = render_biodata_pdf(message.attachment_biodata)
+        except Exception as exc:
+            # No renderer installed yet or a crashed browser: worth retrying
+            raise AttachmentRenderError(f"{type(exc).__name__}: {exc}") from exc
+        email.attach(message.attachment_name or f"biodata_{message.attachment_biodata_id}.pdf",
+                     pdf_bytes, 'application/pdf')
+    elif message.attachment_name:
+        # The spooled upload was removed when the message last failed for good
+        raise ValueError(f"Attachment {message.attachment_name} is no longer available")
+    return email
+
+
+def retry_delay(attempts):
+    base = getattr(settings, 'OUTBOX_RETRY_BACKOFF', 60)
+    return timedelta(seconds=min(base * 2 ** (attempts - 1), 6 * 3600))
+
+
+def deliver(message, mailer):
+    """Send one claimed message and record the outcome. Returns True if sent."""
+    try:
+        mailer.send(build_email(message))
+    except Exception as exc:
+        max_attempts = getattr(settings, 'OUTBOX_MAX_ATTEMPTS', 5)
+        transient = is_transient(exc) or isinstance(exc, AttachmentRenderError)
+        retry = transient and message.attempts < max_attempts
+        message.status = OutboxMessage.STATUS_PENDING if retry else OutboxMessage.STATUS_FAILED
+        message.next_attempt_at = timezone.now() + retry_delay(message.attempts)
+        message.last_error = f"{type(exc).__name__}: {exc}"
+        if not retry and message.attachment:
+            # Final failure: the spooled upload will never be sent
+            message.attachment.delete(save=False)
+        message.save(update_fields=['status', 'next_attempt_at', 'last_error', 'attachment'])
+        logger.warning("Outbox message %s to %s failed (%s): %s", message.pk, message.to,
+                       "will retry" if retry else "giving up", exc)
+        return False
+    message.status = OutboxMessage.STATUS_SENT
+    message.sent_at = timezone.now()
+    message.last_error = ''
+    if message.attachment:
+        # Spooled uploads are only needed until delivery
+        message.attachment.delete(save=False)
+    message.save(update_fields=['status', 'sent_at', 'last_error', 'attachment'])
+    return True
@@ -0,0 +1,62 @@
+"""Pagination for the biodata API and admin."""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db.models import Max
+from django.utils.functional import cached_property
+from rest_framework.pagination import CursorPagination
+
+
+class BiodataCursorPagination(CursorPagination):
+    """Newest-first cursor pages keyed on (created_at, id).
+
+    The cursor is a position rather than an OFFSET, so page 1000 costs the
+    same as page 1; ``id`` breaks ties between rows created in the same
+    instant.
+    """
+    ordering = ('-created_at', '-id')
+    page_size = getattr(settings, 'BIODATA_PAGE_SIZE', 20)
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+    def get_ordering(self, request, queryset, view):
+        # Full-text results (?q=) page in rank order instead
+        if 'search_position' in queryset.query.annotations:
+            return ('search_position', 'id')
+        return super().get_ordering(request, queryset, view)
+
+
+class CachedCountPaginator(Paginator):
+    """Admin paginator with a bounded, cached row count.
+
+    Only the first ADMIN_COUNT_LIMIT + 1 rows are ever counted, so a small
+    (filtered) result gets its exact size. Past the limit an unfiltered list
+    is estimated from MAX(id), an index lookup, and a filtered one reports
+    the limit as a lower bound. Counts are cached for
+    ADMIN_COUNT_CACHE_SECONDS per distinct query, so they may lag new rows.
+    """
+
+    @cached_property
+    def count(self):
+        query = getattr(self.object_list, 'query', None)
+        if query is None:
+            return super().count
+        sql, params = query.sql_with_params()
+        key = 'admin-count:' + hashlib.sha1(f'{query.model._meta.label}|{sql}|{params!r}'.encode()).hexdigest()
+        count = cache.get(key)
+        if count is None:
+            count = self._bounded_count(query)
+            cache.set(key, count, getattr(settings, 'ADMIN_COUNT_CACHE_SECONDS', 30))
+        return count
+
+    def _bounded_count(self, query):
+        limit = getattr(settings, 'ADMIN_COUNT_LIMIT', 10000)
+        count = self.object_list.order_by().values('pk')[:limit + 1].count()
+        if count <= limit:
+            return count
+        if not query.where:
+            highest = query.model._default_manager.using(self.object_list.db).aggregate(Max('pk'))['pk__max']
+            return max(highest or 0, count)
+        return limit
@@ -0,0 +1,258 @@
+"""Content-addressed on-disk cache of rendered biodata PDFs.
+
+A PDF is identified by a fingerprint of everything that affects its render:
+the ``data`` JSON, ``template_choice``, ``user_name`` (used as a fallback
+name), a digest of the profile image, the border file in use (optimized
+variants have versioned names) and ``settings.PDF_TEMPLATE_VERSION``.
+Bump the template version whenever the HTML/CSS of the templates changes.
+
+Files live under ``settings.PDF_CACHE_DIR`` as ``<fp[:2]>/<fp>-<engine>.pdf``
+so the download view and the admin/email path share entries whenever they
+render with the same engine. The cache is bounded by
+``settings.PDF_CACHE_MAX_BYTES``; hits refresh a file's atime and the least
+recently used files are evicted first. A file's mtime stays the time it was
+rendered, which is what the download view reports as Last-Modified.
+"""
+import hashlib
+import io
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+
+from django.conf import settings
+
+from .assets import border_image_path
+
+logger = logging.getLogger(__name__)
+
+# Model fields whose changes invalidate a cached PDF
+RENDER_FIELDS = ('data', 'template_choice', 'user_name', 'profile_image')
+
+_digest_cache = {}
+_digest_lock = threading.Lock()
+
+
+def _sha256(fileobj):
+    h = hashlib.sha256()
+    for chunk in iter(lambda: fileobj.read(1024 * 1024), b''):
+        h.update(chunk)
+    return h.hexdigest()
+
+
+def _memoized_digest(key, compute):
+    with _digest_lock:
+        cached = _digest_cache.get(key)
+    if cached is not None:
+        return cached
+    digest = compute()
+    with _digest_lock:
+        if len(_digest_cache) > 1024:
+            _digest_cache.clear()
+        _digest_cache[key] = digest
+    return digest
+
+
+def file_digest(path):
+    """sha256 of a file, memoized on (path, mtime, size)."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return ''
+
+    def compute():
+        with open(path, 'rb') as f:
+            return _sha256(f)
+    return _memoized_digest((path, st.st_mtime_ns, st.st_size), compute)
+
+
+def artifact_digest(fileobj):
+    """sha256 of an open PDF artifact (memoized like ``file_digest``); rewinds it."""
+    try:
+        st = os.fstat(fileobj.fileno())
+        key = (fileobj.name, st.st_ino, st.st_mtime_ns, st.st_size)
+    except (AttributeError, OSError, ValueError):
+        key = None  # in-memory fallback, see open_or_render_pdf
+
+    def compute():
+        fileobj.seek(0)
+        return _sha256(fileobj)
+    digest = _memoized_digest(key, compute) if key else compute()
+    fileobj.seek(0)
+    return digest
+
+
+def artifact_mtime(fileobj):
+    """Unix time an open PDF artifact was rendered, or ``None``."""
+    try:
+        return int(os.fstat(fileobj.fileno()).st_mtime)
+    except (AttributeError, OSError, ValueError):
+        return None
+
+
+def profile_image_digest(obj):
+    name = getattr(getattr(obj, 'profile_image', None), 'name', None)
+    if not name:
+        return ''
+    return file_digest(os.path.join(settings.MEDIA_ROOT, name))
+
+
+def render_fingerprint(obj):
+    """Return the hex fingerprint identifying the rendered PDF of ``obj``."""
+    payload = {
+        'data': obj.data or {},
+        'template_choice': str(obj.template_choice or ''),
+        'user_name': obj.user_name or '',
+        'profile_image': profile_image_digest(obj),
+        'border': os.path.basename(border_image_path(obj.template_choice)),
+        'template_version': str(getattr(settings, 'PDF_TEMPLATE_VERSION', '1')),
+    }
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+class PdfCache:
+    def __init__(self, root, max_bytes):
+        self.root = str(root)
+        self.max_bytes = int(max_bytes)
+        self._lock = threading.Lock()
+
+    def path_for(self, fingerprint, engine):
+        return os.path.join(self.root, fingerprint[:2], f"{fingerprint}-{engine}.pdf")
+
+    def get(self, fingerprint, engine):
+        """Return cached bytes or ``None``; a hit marks the entry as recently used."""
+        path = self.path_for(fingerprint, engine)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            return None
+        self._touch(path)
+        return data
+
+    def open(self, fingerprint, engine):
+        """Return an open binary file for a cached entry or ``None``.
+
+        An open file stays readable even if eviction unlinks it meanwhile.
+        """
+        path = self.path_for(fingerprint, engine)
+        try:
+            fileobj = open(path, 'rb')
+        except OSError:
+            return None
+        self._touch(path)
+        return fileobj
+
+    def _touch(self, path):
+        """Mark an entry as recently used (atime) without changing its render time (mtime)."""
+        try:
+            os.utime(path, ns=(time.time_ns(), os.stat(path).st_mtime_ns))
+        except OSError:
+            pass
+
+    def put(self, fingerprint, engine, data):
+        path = self.path_for(fingerprint, engine)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write to a temp file first so concurrent readers never see a partial PDF
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        self.evict()
+        return path
+
+    def invalidate(self, fingerprint):
+        """Remove the entries of every engine for ``fingerprint``."""
+        directory = os.path.join(self.root, fingerprint[:2])
+        removed = 0
+        try:
+            names = os.listdir(directory)
+        except OSError:
+            return 0
+        for name in names:
+            if name.startswith(f"{fingerprint}-") and name.endswith('.pdf'):
+                try:
+                    os.unlink(os.path.join(directory, name))
+                    removed += 1
+                except OSError:
+                    pass
+        return removed
+
+    def _entries(self):
+        for dirpath, _dirnames, filenames in os.walk(self.root):
+            for name in filenames:
+                if not name.endswith('.pdf'):
+                    continue
+                path = os.path.join(dirpath, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                yield st.st_atime, st.st_size, path
+
+    def evict(self):
+        """Delete least recently used entries until the cache fits ``max_bytes``."""
+        with self._lock:
+            entries = list(self._entries())
+            total = sum(size for _atime, size, _path in entries)
+            if total <= self.max_bytes:
+                return 0
+            removed = 0
+            for _atime, size, path in sorted(entries):
+                try:
+                    os.unlink(path)
+                except OSError:
+                    continue
+                total -= size
+                removed += 1
+                if total <= self.max_bytes:
+                    break
+            logger.info("PDF cache evicted %s entries", removed)
+            return removed
+
+
+_cache = None
+
+
+def get_pdf_cache():
+    global _cache
+    if _cache is None:
+        _cache = PdfCache(
+            getattr(settings, 'PDF_CACHE_DIR', os.path.join(settings.BASE_DIR, 'pdf_cache')),
+            getattr(settings, 'PDF_CACHE_MAX_BYTES', 512 * 1024 * 1024),
+        )
+    return _cache
+
+
+def get_or_render_pdf(obj, engine, render):
+    """Return ``(pdf_bytes, cache_hit)`` for ``obj``, calling ``render()`` on a miss."""
+    cache = get_pdf_cache()
+    fingerprint = render_fingerprint(obj)
+    data = cache.get(fingerprint, engine)
+    if data is not None:
+        return data, True
+    data = render()
+    cache.put(fingerprint, engine, data)
+    return data, False
+
+
+def open_or_render_pdf(obj, engine, render, fingerprint=None):
+    """Return ``(binary file, cache_hit)`` for ``obj``, calling ``render()`` on a miss."""
+    cache = get_pdf_cache()
+    fingerprint = fingerprint or render_fingerprint(obj)
+    fileobj = cache.open(fingerprint, engine)
+    if fileobj is not None:
+        return fileobj, True
+    data = render()
+    cache.put(fingerprint, engine, data)
+    fileobj = cache.open(fingerprint, engine)
+    # Larger than the whole cache and evicted straight away: serve from memory
+    return (fileobj if fileobj is not None else io.BytesIO(data)), False
@@ -0,0 +1,132 @@
+"""Searchable copies of the commonly filtered PersonalDetails values.
+
+``Biodata.data`` stores every field as ``{label, value}`` inside JSON, so
+filtering on it means decoding every row. ``Biodata.save()`` copies the
+values below into plain indexed columns (see ``PROFILE_COLUMNS``) and
+``apply_profile_filters`` turns API query parameters into lookups on them.
+"""
+import datetime
+import re
+
+# column -> PersonalDetails keys to read it from, first non-empty wins
+PROFILE_FIELD_KEYS = {
+    'name': ('name', 'full_name'),
+    'birth_date': ('date_of_birth', 'dob', 'birth_date'),
+    'height_inches': ('height',),
+    'city': ('residency_city', 'city', 'current_city'),
+    'education': ('education', 'qualification'),
+    'occupation': ('occupation', 'profession'),
+}
+PROFILE_COLUMNS = tuple(PROFILE_FIELD_KEYS)
+TEXT_COLUMNS = ('name', 'city', 'education', 'occupation')
+
+HEIGHT_FT_IN_RE = re.compile(r"""^\s*(\d)\s*(?:'|ft|feet)\s*(?:(\d{1,2})\s*(?:"|''|in|inch|inches)?)?\s*$""", re.I)
+HEIGHT_CM_RE = re.compile(r'^\s*(\d{2,3}(?:\.\d+)?)\s*cm\s*$', re.I)
+DATE_FORMATS = ('%Y-%m-%d', '%d-%m-%Y', '%d/%m/%Y', '%d.%m.%Y')
+
+
+def _raw_value(section, keys):
+    for key in keys:
+        item = section.get(key)
+        value = item.get('value') if isinstance(item, dict) else item
+        if value not in (None, ''):
+            return str(value).strip()
+    return ''
+
+
+def parse_birth_date(value):
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.datetime.strptime(value, fmt).date()
+        except (TypeError, ValueError):
+            continue
+    return None
+
+
+def parse_height_inches(value):
+    """``5' 6"`` (the form's format), ``5ft 6in`` or ``168 cm`` -> inches."""
+    match = HEIGHT_FT_IN_RE.match(value or '')
+    if match:
+        return int(match.group(1)) * 12 + int(match.group(2) or 0)
+    match = HEIGHT_CM_RE.match(value or '')
+    if match:
+        return round(float(match.group(1)) / 2.54)
+    return None
+
+
+def extract_profile_fields(data, max_length=100):
+    """Column values for ``data`` (a Biodata.data dict)."""
+    section = data.get('PersonalDetails') if isinstance(data, dict) else None
+    if not isinstance(section, dict):
+        section = {}
+    values = {column: _raw_value(section, keys) for column, keys in PROFILE_FIELD_KEYS.items()}
+    for column in TEXT_COLUMNS:
+        values[column] = ' '.join(values[column].split())[:max_length]
+    values['birth_date'] = parse_birth_date(values['birth_date'])
+    values['height_inches'] = parse_height_inches(values['height_inches'])
+    return values
+
+
+def _years_before(day, years):
+    try:
+        return day.replace(year=day.year - years)
+    except ValueError:  # 29 February
+        return day.replace(year=day.year - years, day=28)
+
+
+# Accepted filter bounds; anything outside is rejected before it reaches
+# date arithmetic or SQLite integer binding (which overflow on huge values)
+AGE_RANGE = (0, 150)
+HEIGHT_RANGE = (0, 120)  # inches
+
+
+def _int_param(params, name, bounds):
+    value = params.get(name)
+    if value in (None, ''):
+        return None
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{name} must be a whole number")
+    low, high = bounds
+    if not low <= number <= high:
+        raise ValueError(f"{name} must be between {low} and {high}")
+    return number
+
+
+def apply_profile_filters(queryset, params, today=None):
+    """Filter ``queryset`` by ``name`` (prefix), ``city``/``education``/``occupation``
+    (case-insensitive equality), ``age_min``/``age_max`` and
+    ``height_min``/``height_max`` (inches). Raises ValueError on bad numbers.
+
+    Text filters compare LOWER(column), matching the expression indexes, and
+    ages become a birth_date range so they never go stale.
+    """
+    from django.db.models.functions import Lower
+
+    for column in ('city', 'education', 'occupation'):
+        value = ' '.join((params.get(column) or '').split())
+        if value:
+            queryset = queryset.alias(**{f'{column}_lower': Lower(column)}).filter(
+                **{f'{column}_lower': value.lower()})
+
+    prefix = ' '.join((params.get('name') or '').split()).lower()
+    if prefix:
+        # A range instead of LIKE 'x%' so the LOWER(name) index is used
+        upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+        queryset = queryset.alias(name_lower=Lower('name')).filter(name_lower__gte=prefix, name_lower__lt=upper)
+
+    today = today or datetime.date.today()
+    age_min, age_max = _int_param(params, 'age_min', AGE_RANGE), _int_param(params, 'age_max', AGE_RANGE)
+    if age_min is not None:
+        queryset = queryset.filter(birth_date__lte=_years_before(today, age_min))
+    if age_max is not None:
+        queryset = queryset.filter(birth_date__gt=_years_before(today, age_max + 1))
+
+    height_min = _int_param(params, 'height_min', HEIGHT_RANGE)
+    height_max = _int_param(params, 'height_max', HEIGHT_RANGE)
+    if height_min is not None:
+        queryset = queryset.filter(height_inches__gte=height_min)
+    if height_max is not None:
+        queryset = queryset.filter(height_inches__lte=height_max)
+    return queryset
@@ -0,0 +1,71 @@
+"""EXPLAIN checks for the hot Biodata queries.
+
+Each entry of ``hot_queries()`` mirrors a query issued by the API, the
+payment upload view or the admin changelist, together with the index
+(see ``Biodata.Meta.indexes``) meant to serve it. ``plan_problems()`` runs
+``EXPLAIN QUERY PLAN`` (SQLite) on each and reports full table scans and
+queries that stopped using their index, so a dropped index or a query
+rewritten into an unindexable form is caught before it reaches production
+(see ``manage.py check_query_plans``).
+"""
+import re
+
+from django.db import connections
+from django.utils import timezone
+
+# "SCAN biodata_biodata" without "USING [COVERING] INDEX" / "USING INTEGER PRIMARY KEY"
+FULL_SCAN_RE = re.compile(r'\bSCAN (?:TABLE )?(?P<table>\w+)(?! USING)(?!\w)')
+
+
+def hot_queries():
+    """``{name: (queryset, expected index)}``."""
+    from .models import Biodata
+    from .profile_fields import apply_profile_filters
+
+    now = timezone.now()
+    profile = Biodata.objects.order_by('-created_at', '-id')
+    return {
+        'api list, first page': (
+            Biodata.objects.order_by('-created_at', '-id')[:21], 'biodata_created_id_idx'),
+        'api list, cursor page': (
+            Biodata.objects.filter(created_at__lt=now).order_by('-created_at', '-id')[:21], 'biodata_created_id_idx'),
+        'payment upload, by email': (
+            Biodata.objects.for_email('User@Example.com').order_by('-created_at')[:1], 'biodata_email_lower_idx'),
+        'payment upload, no screenshot': (
+            Biodata.objects.without_payment_screenshot().order_by('-created_at')[:1], 'biodata_no_screenshot_idx'),
+        'admin, pending filter': (
+            Biodata.objects.filter(is_approved=False).order_by('-pk')[:100], 'biodata_pending_idx'),
+        'admin, template filter': (
+            Biodata.objects.filter(template_choice='5').order_by('-pk')[:100], 'biodata_template_idx'),
+        'api filter, city': (
+            apply_profile_filters(profile, {'city': 'Pune'})[:21], 'biodata_city_lower_idx'),
+        'api filter, name prefix': (
+            apply_profile_filters(profile, {'name': 'Pri'})[:21], 'biodata_name_lower_idx'),
+        'api filter, age range': (
+            apply_profile_filters(profile, {'age_min': 25, 'age_max': 30})[:21], 'biodata_birth_date_idx'),
+        'api filter, height range': (
+            apply_profile_filters(profile, {'height_min': 62, 'height_max': 70})[:21], 'biodata_height_idx'),
+    }
+
+
+def explain(queryset, using='default'):
+    """Plan lines for ``queryset`` as reported by the database."""
+    return queryset.using(using).explain().splitlines()
+
+
+def plan_problems(using='default'):
+    """``{query name: (problems, plan lines)}`` for the offending queries.
+
+    Only SQLite plans are inspected; other backends return ``{}``.
+    """
+    if connections[using].vendor != 'sqlite':
+        return {}
+    offenders = {}
+    for name, (queryset, index) in hot_queries().items():
+        plan = explain(queryset, using)
+        problems = [f"full scan of {m.group('table')}" for line in plan for m in FULL_SCAN_RE.finditer(line)]
+        if not any(f'INDEX {index}' in line for line in plan):
+            problems.append(f"{index} not used")
+        if problems:
+            offenders[name] = (problems, plan)
+    return offenders
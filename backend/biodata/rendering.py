@@ -0,0 +1,303 @@
+"""HTML -> PDF rendering.
+
+All PDF paths go through ``render_biodata_pdf``, which builds the
+frontend-matching HTML and hands it to the renderer backend configured for
+the biodata's template in ``settings.PDF_RENDERERS``:
+
+- ``PlaywrightRenderer``: headless Chromium from the warm browser pool.
+- ``WeasyPrintRenderer``: WeasyPrint (optional dependency).
+- ``XHTML2PDFRenderer``: xhtml2pdf, pure Python (optional dependency).
+
+Each setting value is a backend name, a dotted path to a ``BaseRenderer``
+subclass, or a list of those tried in order until one is installed.
+
+For Playwright two load modes are supported (``settings.PDF_RENDER_MODE``):
+
+- ``'inline'`` (default): the HTML is handed to the page in memory with
+  ``page.set_content`` and we wait only until web fonts and images (including
+  CSS background images) have actually loaded, bounded by
+  ``settings.PDF_READY_TIMEOUT_MS``.
+- ``'file'``: the legacy behaviour, writing a temp file, loading it with
+  ``page.goto('file:///...')`` and always sleeping one second.
+
+Each render can record per-stage timings in a ``RenderTimings`` instance so
+slow stages (HTML build, load, layout, PDF) show up in the logs.
+"""
+import importlib.util
+import logging
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+
+from io import BytesIO
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+from .browser_pool import get_browser_pool
+from .pdf_cache import artifact_digest, get_or_render_pdf, open_or_render_pdf, render_fingerprint
+
+logger = logging.getLogger(__name__)
+
+PDF_OPTIONS = {
+    'format': 'A4',
+    'print_background': True,
+    'margin': {'top': '0', 'right': '0', 'bottom': '0', 'left': '0'},
+}
+
+# Resolves once fonts, <img> elements and CSS background images are loaded,
+# or after ``timeoutMs`` - whichever comes first. Returns true when ready.
+READY_SCRIPT = """
+async (timeoutMs) => {
+    const settle = (img) => (img.complete && img.naturalWidth !== 0) ? Promise.resolve() :
+        new Promise((resolve) => {
+            img.addEventListener('load', resolve, {once: true});
+            img.addEventListener('error', resolve, {once: true});
+        });
+    const backgrounds = [];
+    for (const el of document.querySelectorAll('*')) {
+        const bg = getComputedStyle(el).backgroundImage;
+        const match = bg && bg.match(/url\\(["']?(.*?)["']?\\)/);
+        if (match) {
+            const img = new Image();
+            img.src = match[1];
+            backgrounds.push(img.decode ? img.decode().catch(() => {}) : settle(img));
+        }
+    }
+    const ready = Promise.all([
+        document.fonts ? document.fonts.ready : Promise.resolve(),
+        ...Array.from(document.images, settle),
+        ...backgrounds,
+    ]).then(() => true);
+    const timeout = new Promise((resolve) => setTimeout(() => resolve(false), timeoutMs));
+    return Promise.race([ready, timeout]);
+}
+"""
+
+
+class RenderTimings:
+    """Collects wall-clock durations (in ms) for the named stages of a render."""
+
+    def __init__(self):
+        self.stages = {}
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + (time.perf_counter() - start) * 1000
+
+    @property
+    def total_ms(self):
+        return sum(self.stages.values())
+
+    def as_dict(self):
+        data = {name: round(ms, 1) for name, ms in self.stages.items()}
+        data['total'] = round(self.total_ms, 1)
+        return data
+
+    def __str__(self):
+        return ' '.join(f"{name}={ms:.0f}ms" for name, ms in self.as_dict().items())
+
+
+def get_render_mode():
+    return getattr(settings, 'PDF_RENDER_MODE', 'inline')
+
+
+def _render_inline(page, html, timings):
+    timeout_ms = getattr(settings, 'PDF_READY_TIMEOUT_MS', 5000)
+    with timings.stage('load'):
+        page.set_content(html, wait_until='domcontentloaded')
+    with timings.stage('layout'):
+        ready = page.evaluate(READY_SCRIPT, timeout_ms)
+        if not ready:
+            logger.warning("PDF render: assets not ready after %sms, printing anyway", timeout_ms)
+    with timings.stage('pdf'):
+        return page.pdf(**PDF_OPTIONS)
+
+
+def _render_from_file(page, path, timings):
+    with timings.stage('load'):
+        page.goto(f'file:///{path}')
+    with timings.stage('layout'):
+        page.wait_for_timeout(1000)  # Wait for fonts/images to load
+    with timings.stage('pdf'):
+        return page.pdf(**PDF_OPTIONS)
+
+
+def render_pdf(html, timings=None, mode=None):
+    """Render ``html`` to PDF bytes on a pooled browser.
+
+    Raises ``ImportError`` if Playwright is not installed.
+    """
+    import playwright.sync_api  # noqa: F401  (fail fast in the caller's thread)
+
+    timings = timings if timings is not None else RenderTimings()
+    mode = mode or get_render_mode()
+    pool = get_browser_pool()
+
+    if mode == 'file':
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.html', delete=False, encoding='utf-8') as f:
+            f.write(html)
+            temp_path = f.name
+        try:
+            return pool.run(lambda page: _render_from_file(page, temp_path, timings))
+        finally:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+
+    return pool.run(lambda page: _render_inline(page, html, timings))
+
+
+# -- renderer backends -------------------------------------------------------
+
+class RendererUnavailable(Exception):
+    """The backend's library is not installed in this environment."""
+
+
+class BaseRenderer:
+    """Turns a complete HTML document into PDF bytes.
+
+    ``name`` is part of the PDF cache key, so two backends never share
+    cached output.
+    """
+    name = None
+    # Package the backend imports; lets callers check for it without rendering
+    module = None
+
+    def is_installed(self):
+        return self.module is None or importlib.util.find_spec(self.module) is not None
+
+    def render(self, html, timings=None):
+        raise NotImplementedError
+
+
+class PlaywrightRenderer(BaseRenderer):
+    name = 'playwright'
+    module = 'playwright'
+
+    def render(self, html, timings=None):
+        try:
+            return render_pdf(html, timings=timings)
+        except ImportError:
+            raise RendererUnavailable("Playwright not installed")
+
+
+class WeasyPrintRenderer(BaseRenderer):
+    name = 'weasyprint'
+    module = 'weasyprint'
+
+    def render(self, html, timings=None):
+        try:
+            from weasyprint import HTML
+        except ImportError:
+            raise RendererUnavailable("WeasyPrint not installed")
+        timings = timings if timings is not None else RenderTimings()
+        with timings.stage('pdf'):
+            return HTML(string=html, base_url=str(settings.BASE_DIR.parent)).write_pdf()
+
+
+class XHTML2PDFRenderer(BaseRenderer):
+    name = 'xhtml2pdf'
+    module = 'xhtml2pdf'
+
+    def render(self, html, timings=None):
+        try:
+            from xhtml2pdf import pisa
+        except ImportError:
+            raise RendererUnavailable("xhtml2pdf not installed")
+        timings = timings if timings is not None else RenderTimings()
+        out = BytesIO()
+        with timings.stage('pdf'):
+            result = pisa.CreatePDF(html, dest=out, encoding='utf-8')
+        if result.err:
+            raise RuntimeError(f"xhtml2pdf reported {result.err} error(s)")
+        return out.getvalue()
+
+
+RENDERERS = {
+    renderer.name: renderer
+    for renderer in (PlaywrightRenderer, WeasyPrintRenderer, XHTML2PDFRenderer)
+}
+
+
+def _load_renderer(spec):
+    if spec in RENDERERS:
+        return RENDERERS[spec]()
+    return import_string(spec)()
+
+
+def get_renderers(template_choice=None):
+    """Return the configured renderer instances for a template, in fallback order."""
+    conf = getattr(settings, 'PDF_RENDERERS', {}) or {}
+    spec = conf.get(str(template_choice or ''), conf.get('default', PlaywrightRenderer.name))
+    if isinstance(spec, str):
+        spec = [spec]
+    return [_load_renderer(item) for item in spec]
+
+
+def renderer_available(template_choice=None):
+    """Whether any renderer configured for the template is installed."""
+    return any(renderer.is_installed() for renderer in get_renderers(template_choice))
+
+
+def build_biodata_html(biodata):
+    """Build the frontend-matching HTML document for ``biodata``."""
+    from .html_templates import build_frontend_html
+    return build_frontend_html(biodata)
+
+
+def _with_renderers(biodata, timings, fetch):
+    """Call ``fetch(engine_name, render)`` with the first installed renderer."""
+    timings = timings if timings is not None else RenderTimings()
+    unavailable = []
+    for renderer in get_renderers(biodata.template_choice):
+        def render():
+            with timings.stage('html_build'):
+                html = build_biodata_html(biodata)
+            return renderer.render(html, timings=timings)
+        try:
+            return fetch(renderer.name, render)
+        except RendererUnavailable as exc:
+            logger.warning("PDF renderer %s unavailable: %s", renderer.name, exc)
+            unavailable.append(str(exc))
+    raise RendererUnavailable('; '.join(unavailable) or "No PDF renderer configured")
+
+
+def render_biodata_pdf(biodata, timings=None):
+    """Return ``(pdf_bytes, cache_hit)`` for ``biodata``.
+
+    Uses the first installed renderer configured for its template; raises
+    ``RendererUnavailable`` if none of them is installed.
+    """
+    return _with_renderers(
+        biodata, timings, lambda engine, render: get_or_render_pdf(biodata, engine, render)
+    )
+
+
+def pdf_etag(fileobj):
+    """Strong ETag of a stored PDF artifact: the sha256 of its bytes.
+
+    Not derived from the fingerprint: Chromium and WeasyPrint embed a
+    creation date/ID, so re-rendering the same inputs (after eviction)
+    gives different bytes, which must not share a validator.
+    """
+    return f'"{artifact_digest(fileobj)}"'
+
+
+def open_biodata_pdf(biodata, fingerprint=None, timings=None):
+    """Return ``(file, etag, cache_hit)`` for the stored PDF artifact of ``biodata``.
+
+    The file is opened from the PDF cache (rendering first on a miss) so the
+    caller can stream it; the caller must close it.
+    """
+    fingerprint = fingerprint or render_fingerprint(biodata)
+
+    def fetch(engine, render):
+        fileobj, cache_hit = open_or_render_pdf(biodata, engine, render, fingerprint=fingerprint)
+        return fileobj, pdf_etag(fileobj), cache_hit
+
+    return _with_renderers(biodata, timings, fetch)
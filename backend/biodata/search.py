@@ -0,0 +1,145 @@
+"""Full-text search over biodata using an SQLite FTS5 shadow table.
+
+``biodata_search`` holds one row per Biodata (rowid = biodata id) with the
+contact fields and the flattened values of every ``data`` section. It is
+created by migration 0010, updated by the save/delete signals and can be
+rebuilt with ``manage.py rebuild_search_index``. ``search_ids`` returns ids
+ranked by bm25; the admin search box and the API's ``?q=`` use it.
+
+On other database backends, and on SQLite builds compiled without FTS5, the
+functions are no-ops and callers fall back to their LIKE-based search.
+"""
+import re
+
+from django.db import DatabaseError, connection, transaction
+
+TABLE = 'biodata_search'
+COLUMNS = ('title', 'user_name', 'user_email', 'user_phone', 'content')
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+CREATE_SQL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {TABLE} USING fts5("
+    f"{', '.join(COLUMNS)}, tokenize = 'unicode61 remove_diacritics 2')"
+)
+DROP_SQL = f"DROP TABLE IF EXISTS {TABLE}"
+
+
+PROBE_SQL = "CREATE VIRTUAL TABLE temp.biodata_fts5_probe USING fts5(a)"
+
+# connection alias -> whether its SQLite library has FTS5
+_fts5_support = {}
+
+
+def _probe_fts5(conn):
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute(PROBE_SQL)
+            cursor.execute("DROP TABLE temp.biodata_fts5_probe")
+    except DatabaseError:
+        return False
+    return True
+
+
+def is_available(conn=None):
+    """Whether ``conn`` is SQLite with FTS5; probed once per connection alias."""
+    conn = conn or connection
+    if conn.vendor != 'sqlite':
+        return False
+    if conn.alias not in _fts5_support:
+        _fts5_support[conn.alias] = _probe_fts5(conn)
+    return _fts5_support[conn.alias]
+
+
+def _flatten(value, out):
+    if isinstance(value, dict):
+        if 'value' in value:
+            _flatten(value['value'], out)
+        else:
+            for item in value.values():
+                _flatten(item, out)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            _flatten(item, out)
+    elif value not in (None, ''):
+        out.append(str(value))
+
+
+def document_for(biodata):
+    """Column values indexed for ``biodata``."""
+    values = []
+    _flatten(biodata.data or {}, values)
+    return (biodata.title or '', biodata.user_name or '', biodata.user_email or '',
+            biodata.user_phone or '', '\n'.join(values))
+
+
+def index_biodata(biodata, conn=None):
+    conn = conn or connection
+    if not is_available(conn):
+        return
+    with conn.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {TABLE} WHERE rowid = %s", [biodata.pk])
+        cursor.execute(
+            f"INSERT INTO {TABLE} (rowid, {', '.join(COLUMNS)}) VALUES (%s, %s, %s, %s, %s, %s)",
+            [biodata.pk, *document_for(biodata)],
+        )
+
+
+def remove_biodata(pk, conn=None):
+    conn = conn or connection
+    if not is_available(conn):
+        return
+    with conn.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {TABLE} WHERE rowid = %s", [pk])
+
+
+def rebuild_index(queryset, conn=None, batch_size=500):
+    """Re-index every row of ``queryset``; returns the number of rows."""
+    conn = conn or connection
+    if not is_available(conn):
+        return 0
+    count = 0
+    with transaction.atomic(using=conn.alias), conn.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {TABLE}")
+        rows = []
+        for obj in queryset.only('id', 'title', 'user_name', 'user_email', 'user_phone', 'data').iterator(chunk_size=batch_size):
+            rows.append([obj.pk, *document_for(obj)])
+            if len(rows) >= batch_size:
+                cursor.executemany(f"INSERT INTO {TABLE} (rowid, {', '.join(COLUMNS)}) VALUES (%s, %s, %s, %s, %s, %s)", rows)
+                count += len(rows)
+                rows = []
+        if rows:
+            cursor.executemany(f"INSERT INTO {TABLE} (rowid, {', '.join(COLUMNS)}) VALUES (%s, %s, %s, %s, %s, %s)", rows)
+            count += len(rows)
+    return count
+
+
+def match_expression(query):
+    """FTS5 query for free text: every word must match as a prefix."""
+    return ' '.join(f'"{token}"*' for token in TOKEN_RE.findall(query or ''))
+
+
+def search_ids(query, limit=500, conn=None):
+    """Biodata ids matching ``query``, best bm25 rank first."""
+    conn = conn or connection
+    expression = match_expression(query)
+    if not expression or not is_available(conn):
+        return []
+    with conn.cursor() as cursor:
+        cursor.execute(
+            f"SELECT rowid FROM {TABLE} WHERE {TABLE} MATCH %s ORDER BY rank LIMIT %s",
+            [expression, limit],
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+def rank_expression(ids):
+    """Expression giving each of ``ids`` its position (0 = best match)."""
+    from django.db.models import Case, IntegerField, Value, When
+    if not ids:
+        return Value(0, output_field=IntegerField())
+    return Case(*[When(pk=pk, then=Value(i)) for i, pk in enumerate(ids)], output_field=IntegerField())
+
+
+def ranked(queryset, ids):
+    """Restrict ``queryset`` to ``ids`` and annotate ``search_position``."""
+    return queryset.filter(pk__in=ids).annotate(search_position=rank_expression(ids))
@@ -3,9 +3,30 @@ from .models import Biodata
 import json
 
 
+# Model columns each computed field needs when ``?fields=`` trims the SELECT
+SOURCE_FIELDS = {
+    'profile_thumbnail': ('profile_image',),
+}
 
 
-class BiodataSerializer(serializers.ModelSerializer):
+def parse_fields_param(value):
+    """Split a ``?fields=a,b`` value into a list of names (empty = all fields)."""
+    return [name.strip() for name in (value or '').split(',') if name.strip()]
+
+
+class SparseFieldsMixin:
+    """Drop every field not listed in ``context['fields']`` (when given)."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        requested = self.context.get('fields')
+        if requested:
+            for name in set(self.fields) - set(requested):
+                self.fields.pop(name)
+
+
+class BiodataSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    profile_thumbnail = serializers.SerializerMethodField()
 
     def create(self, validated_data):
         # Auto-approve free biodata (template_choice == 1 or '1')
@@ -17,13 +38,22 @@ class BiodataSerializer(serializers.ModelSerializer):
     class Meta:
         model = Biodata
         fields = (
-            'id', 'title', 'data', 'profile_image', 'payment_screenshot',
+            'id', 'title', 'data', 'profile_image', 'profile_thumbnail', 'payment_screenshot',
             'template_choice', 'user_name', 'user_email', 'user_phone',
             'is_approved', 'download_link',
             'created_at', 'updated_at'
         )
         read_only_fields = ('id', 'is_approved', 'download_link', 'created_at', 'updated_at')
 
+    def get_profile_thumbnail(self, obj):
+        """URL of the small list-size photo generated at upload (no original download)."""
+        from .images import profile_derivative_url
+        url = profile_derivative_url(obj, 'list') if obj.profile_image else None
+        request = self.context.get('request')
+        if url and request is not None:
+            return request.build_absolute_uri(url)
+        return url
+
     def to_internal_value(self, data):
         """Normalize incoming multipart data into plain dict and parse data JSON.
 
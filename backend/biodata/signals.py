@@ -0,0 +1,70 @@
+from django.db import connections
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from .images import delete_image_derivatives, generate_profile_derivatives, payment_thumbnail
+from .models import Biodata
+from .pdf_cache import RENDER_FIELDS, get_pdf_cache, render_fingerprint
+from .search import index_biodata, remove_biodata
+
+
+@receiver(pre_save, sender=Biodata)
+def remember_render_fingerprint(sender, instance, update_fields=None, **kwargs):
+    """Stash the fingerprint of the stored row so post_save can detect render changes."""
+    instance._previous_render_fingerprint = None
+    instance._previous_profile_image = None
+    if not instance.pk:
+        return
+    if update_fields is not None and not set(update_fields) & set(RENDER_FIELDS):
+        return
+    previous = Biodata.objects.filter(pk=instance.pk).only(*RENDER_FIELDS).first()
+    if previous is not None:
+        instance._previous_render_fingerprint = render_fingerprint(previous)
+        instance._previous_profile_image = previous.profile_image.name or None
+
+
+@receiver(post_save, sender=Biodata)
+def invalidate_stale_pdf(sender, instance, **kwargs):
+    previous = getattr(instance, '_previous_render_fingerprint', None)
+    if previous and previous != render_fingerprint(instance):
+        get_pdf_cache().invalidate(previous)
+
+
+@receiver(post_save, sender=Biodata)
+def create_profile_derivatives(sender, instance, created=False, update_fields=None, **kwargs):
+    """Generate the resized profile photos whenever a new photo is stored."""
+    if update_fields is not None and 'profile_image' not in update_fields:
+        return
+    current = instance.profile_image.name or None
+    previous = getattr(instance, '_previous_profile_image', None)
+    if not created and current == previous:
+        return
+    if previous and previous != current:
+        delete_image_derivatives(previous, instance.profile_image.storage)
+    if current:
+        generate_profile_derivatives(instance)
+
+
+@receiver(post_save, sender=Biodata)
+def create_payment_thumbnail(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Build the admin changelist thumbnail when a payment screenshot is stored."""
+    if raw or (update_fields is not None and 'payment_screenshot' not in update_fields):
+        return
+    if instance.payment_screenshot:
+        payment_thumbnail(instance)  # no-op if the thumbnail already exists
+
+
+@receiver(post_save, sender=Biodata)
+def update_search_index(sender, instance, using=None, raw=False, **kwargs):
+    if not raw:
+        index_biodata(instance, connections[using or 'default'])
+
+
+@receiver(post_delete, sender=Biodata)
+def drop_deleted_pdf(sender, instance, **kwargs):
+    get_pdf_cache().invalidate(render_fingerprint(instance))
+
+
+@receiver(post_delete, sender=Biodata)
+def drop_from_search_index(sender, instance, using=None, **kwargs):
+    remove_biodata(instance.pk, connections[using or 'default'])
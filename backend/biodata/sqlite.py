@@ -0,0 +1,35 @@
+"""Opt-in SQLite profile for concurrent writers.
+
+With ``SQLITE_CONCURRENT_WRITES`` enabled every new SQLite connection gets
+``SQLITE_PRAGMAS`` applied (WAL journaling, busy_timeout, synchronous=NORMAL,
+mmap and page cache size). WAL lets readers proceed while one writer
+commits, and busy_timeout makes competing writers wait for the lock instead
+of failing with "database is locked". Connected in ``BiodataConfig.ready``;
+``manage.py bench_sqlite_writes`` compares it with the default settings.
+"""
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def sqlite_pragmas():
+    """The PRAGMAs to apply; settings.SQLITE_PRAGMAS is the only source."""
+    from django.conf import settings
+    return getattr(settings, 'SQLITE_PRAGMAS', None) or {}
+
+
+def apply_pragmas(connection, pragmas):
+    with connection.cursor() as cursor:
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name} = {value}')
+
+
+def configure_sqlite_connection(sender, connection, **kwargs):
+    """``connection_created`` receiver applying the profile when enabled."""
+    from django.conf import settings
+    if connection.vendor != 'sqlite' or not getattr(settings, 'SQLITE_CONCURRENT_WRITES', False):
+        return
+    try:
+        apply_pragmas(connection, sqlite_pragmas())
+    except Exception:
+        logger.exception("Could not apply SQLite PRAGMAs to %s", connection.alias)
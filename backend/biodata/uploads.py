@@ -0,0 +1,79 @@
+"""Size-capped multipart uploads spooled straight to disk.
+
+Django keeps uploads smaller than FILE_UPLOAD_MAX_MEMORY_SIZE in memory and
+has no per-file limit. ``SpooledMultiPartParser`` writes every file to a
+temporary file as it arrives and stops accepting one once it grows past
+``max_upload_size`` bytes, answering 413 instead.
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.files.uploadhandler import SkipFile, TemporaryFileUploadHandler
+from django.http.multipartparser import MultiPartParser as DjangoMultiPartParser, MultiPartParserError
+from rest_framework import status
+from rest_framework.exceptions import APIException, ParseError
+from rest_framework.parsers import DataAndFiles, MultiPartParser
+
+# Allowance for the non-file form fields and multipart boundaries
+FORM_OVERHEAD = 64 * 1024
+
+
+def file_sha256(uploaded):
+    """Hex sha256 of an uploaded file, read in chunks from its spooled copy."""
+    digest = hashlib.sha256()
+    for chunk in uploaded.chunks():
+        digest.update(chunk)
+    uploaded.seek(0)
+    return digest.hexdigest()
+
+
+class UploadTooLarge(APIException):
+    status_code = status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+    default_detail = 'Uploaded file is too large.'
+    default_code = 'upload_too_large'
+
+
+class CappedTemporaryFileUploadHandler(TemporaryFileUploadHandler):
+    """Temporary-file upload handler that refuses files over ``max_size``."""
+
+    def __init__(self, request=None, max_size=None):
+        super().__init__(request)
+        self.max_size = max_size
+        self.too_large = False
+
+    def handle_raw_input(self, input_data, META, content_length, boundary, encoding=None):
+        # Reject before reading the body when the client declares its size
+        if content_length and content_length > self.max_size + FORM_OVERHEAD:
+            raise UploadTooLarge()
+
+    def receive_data_chunk(self, raw_data, start):
+        if start + len(raw_data) > self.max_size:
+            self.too_large = True
+            raise SkipFile()  # Django closes (and deletes) the partial temp file
+        return super().receive_data_chunk(raw_data, start)
+
+
+class SpooledMultiPartParser(MultiPartParser):
+    """``MultiPartParser`` using ``CappedTemporaryFileUploadHandler`` for every file.
+
+    ``max_upload_size`` defaults to settings.EMAIL_UPLOAD_MAX_BYTES.
+    """
+    max_upload_size = None
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        request = parser_context['request']
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        meta = request.META.copy()
+        meta['CONTENT_TYPE'] = media_type
+        max_size = self.max_upload_size or getattr(settings, 'EMAIL_UPLOAD_MAX_BYTES', 10 * 1024 * 1024)
+        handler = CappedTemporaryFileUploadHandler(request, max_size)
+        try:
+            data, files = DjangoMultiPartParser(meta, stream, [handler], encoding).parse()
+        except MultiPartParserError as exc:
+            raise ParseError('Multipart form parse error - %s' % str(exc))
+        if handler.too_large:
+            for uploaded in files.values():
+                uploaded.close()
+            raise UploadTooLarge(f'Uploaded file is larger than {max_size // (1024 * 1024)} MB.')
+        return DataAndFiles(data, files)
@@ -2,6 +2,7 @@ from rest_framework.routers import DefaultRouter
 from django.urls import path, include
 from .views import BiodataViewSet
 from .views import biodata_download_view, biodata_html_view, biodata_pdf_view, payment_verify_view, upload_pdf_and_send_email
+from .views import email_biodata_pdf_view, email_status_view
 
 router = DefaultRouter()
 router.register(r'biodata', BiodataViewSet, basename='biodata')
@@ -12,7 +13,10 @@ urlpatterns = [
     path('download/<int:pk>/', biodata_html_view, name='biodata-html-download'),
     # Direct PDF generation endpoint (used by frontend to download .pdf)
     path('biodata/<int:pk>/download/', biodata_pdf_view, name='biodata-pdf-download'),
+    # Server-rendered PDF emailed to the biodata's own address
+    path('biodata/<int:pk>/email/', email_biodata_pdf_view, name='biodata-pdf-email'),
     path('payment/verify/', payment_verify_view, name='payment-verify'),
     path('upload_pdf_and_send_email/', upload_pdf_and_send_email, name='upload-pdf-and-send-email'),
+    path('email_status/<str:job_id>/', email_status_view, name='email-status'),
     # Removed free email endpoint: free PDF will not send email
 ]
@@ -1,27 +1,44 @@
 ## Removed send_free_email_view: free PDF will not send email. Premium logic untouched.
 from rest_framework import viewsets
-from .models import Biodata
-from .serializers import BiodataSerializer
-
+from rest_framework.exceptions import ValidationError
+from .models import Biodata, OutboxMessage
+from .outbox import queue_email
+from .pagination import BiodataCursorPagination
+from .profile_fields import apply_profile_filters
+from . import search
+from .serializers import SOURCE_FIELDS, BiodataSerializer, parse_fields_param
+from .http import is_not_modified, not_modified_response, ranged_file_response
+from .pdf_cache import artifact_mtime, render_fingerprint
+from .rendering import RendererUnavailable, open_biodata_pdf, renderer_available
+from .uploads import SpooledMultiPartParser, file_sha256
+
+from datetime import timedelta
+
+from django.conf import settings
 from django.shortcuts import render, get_object_or_404
 from django.core.signing import TimestampSigner, BadSignature, SignatureExpired
 from django.http import HttpResponseForbidden
 from django.http import HttpResponse, HttpResponseServerError
 from django.template.loader import render_to_string
+from django.urls import reverse
+from django.utils import timezone
 from rest_framework.decorators import api_view, parser_classes, permission_classes
 from rest_framework.parsers import MultiPartParser, FormParser
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from rest_framework import status
 from django.core.files.base import ContentFile
-from django.core.mail import EmailMessage
 @api_view(['POST'])
-@parser_classes([MultiPartParser, FormParser])
+@parser_classes([SpooledMultiPartParser, FormParser])
 @permission_classes([AllowAny])
 def upload_pdf_and_send_email(request):
     """
-    Receives a PDF file and email address, then sends the PDF as an attachment.
+    Receives a PDF file and email address and queues an email with the PDF
+    attached (delivered by ``manage.py deliver_outbox``).
     Expects 'pdf' (file) and 'email' (string) in the POST data.
+
+    The upload is spooled to disk (at most EMAIL_UPLOAD_MAX_BYTES, else 413)
+    and the view answers 202 with a job id; poll ``status_url`` for delivery.
     """
     pdf_file = request.FILES.get('pdf')
     email_address = request.data.get('email')
@@ -29,16 +46,134 @@ def upload_pdf_and_send_email(request):
         return Response({'error': 'PDF file and email are required.'}, status=status.HTTP_400_BAD_REQUEST)
 
     try:
-        email = EmailMessage(
-            subject="Your Biodata PDF is Attached!",
-            body="Dear user,\n\nYour biodata PDF is attached as requested.",
-            to=[email_address]
+        message = queue_email(
+            email_address,
+            "Your Biodata PDF is Attached!",
+            "Dear user,\n\nYour biodata PDF is attached as requested.",
+            attachment=pdf_file,
+            attachment_name=pdf_file.name,
+            # Content hash: the client names every upload "biodata.pdf"
+            dedupe_key=f"upload:{email_address.lower()}:{file_sha256(pdf_file)}",
         )
-        email.attach(pdf_file.name, pdf_file.read(), 'application/pdf')
-        email.send()
-        return Response({'success': True}, status=status.HTTP_200_OK)
     except Exception as e:
         return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    return email_job_response(request, message)
+
+
+class BiodataOwnerSigner(TimestampSigner):
+    """Signs biodata ids handed to the creator so they can act on that record."""
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault('salt', 'biodata.views.BiodataOwnerSigner')
+        super().__init__(**kwargs)
+
+
+def is_biodata_owner(request, biodata):
+    """True for the signed ``owner_token`` from creation or the owner's own login."""
+    token = request.data.get('owner_token') or ''
+    if token:
+        try:
+            return BiodataOwnerSigner().unsign(token, max_age=60 * 60 * 24 * 30) == str(biodata.pk)
+        except BadSignature:  # includes SignatureExpired
+            return False
+    user = getattr(request, 'user', None)
+    return bool(user and user.is_authenticated and user.email and biodata.user_email
+                and user.email.lower() == biodata.user_email.lower())
+
+
+@api_view(['POST'])
+@permission_classes([AllowAny])
+def email_biodata_pdf_view(request, pk):
+    """
+    Emails a biodata's PDF to its ``user_email``.
+
+    The caller must own the record: pass the ``owner_token`` returned when it
+    was created, or be logged in with its email address. At most
+    BIODATA_EMAIL_PER_HOUR emails per record are queued (429). While the
+    biodata awaits approval the email is held (status ``held``) and sent by
+    the approval job instead of a second approval email.
+
+    The PDF is rendered on the server by the same backend and PDF cache as
+    ``biodata_pdf_view``: the outbox attaches it when the message is sent.
+    Answers 202 like ``upload_pdf_and_send_email``, or 501 if no renderer
+    is installed so the frontend can fall back to uploading its own PDF.
+    """
+    biodata = get_object_or_404(Biodata, pk=pk)
+    if not is_biodata_owner(request, biodata):
+        return Response({'error': 'Not allowed to email this biodata.'}, status=status.HTTP_403_FORBIDDEN)
+    if not biodata.user_email:
+        return Response({'error': 'This biodata has no email address.'}, status=status.HTTP_400_BAD_REQUEST)
+    fingerprint = render_fingerprint(biodata)
+    dedupe_key = f"biodata-pdf:{biodata.pk}:{fingerprint}"
+    recent = OutboxMessage.objects.filter(
+        attachment_biodata=biodata, dedupe_key__startswith='biodata-pdf:',
+        created_at__gte=timezone.now() - timedelta(hours=1),
+    )
+    per_hour = getattr(settings, 'BIODATA_EMAIL_PER_HOUR', 3)
+    if not recent.filter(dedupe_key=dedupe_key).exists() and recent.count() >= per_hour:
+        return Response({'error': 'Too many emails for this biodata; try again later.'},
+                        status=status.HTTP_429_TOO_MANY_REQUESTS)
+    if not renderer_available(biodata.template_choice):
+        return Response({'error': 'PDF generation not available on server.'}, status=status.HTTP_501_NOT_IMPLEMENTED)
+
+    if not biodata.is_approved:
+        # One held email per record; it renders whatever is current at approval
+        held = biodata.outbox_messages.filter(status=OutboxMessage.STATUS_HELD).first()
+        if held is not None:
+            return email_job_response(request, held)
+    message = queue_email(
+        biodata.user_email,
+        "Your Biodata PDF is Attached!",
+        f"Dear {biodata.user_name or 'user'},\n\nYour biodata PDF is attached as requested.",
+        attachment_biodata=biodata,
+        attachment_name=f"biodata_{biodata.pk}.pdf",
+        # Repeated requests for an unchanged record reuse the queued email
+        dedupe_key=dedupe_key,
+        hold=not biodata.is_approved,
+    )
+    return email_job_response(request, message)
+
+
+class EmailStatusSigner(TimestampSigner):
+    """Signs outbox message ids so delivery status can't be enumerated."""
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault('salt', 'biodata.views.EmailStatusSigner')
+        super().__init__(**kwargs)
+
+
+def email_job_response(request, message):
+    """202 response describing a queued OutboxMessage."""
+    job_id = EmailStatusSigner().sign(str(message.pk))
+    return Response({
+        'success': True,
+        'queued': True,
+        'job_id': job_id,
+        'status': message.status,
+        'status_url': request.build_absolute_uri(reverse('email-status', args=[job_id])),
+    }, status=status.HTTP_202_ACCEPTED)
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def email_status_view(request, job_id):
+    """Delivery status of an email queued by the upload or biodata email endpoints."""
+    try:
+        pk = EmailStatusSigner().unsign(job_id, max_age=60 * 60 * 24 * 7)
+    except BadSignature:  # includes SignatureExpired
+        return Response({'error': 'Unknown job id.'}, status=status.HTTP_404_NOT_FOUND)
+    message = OutboxMessage.objects.filter(pk=pk).only('status', 'attempts', 'sent_at', 'next_attempt_at').first()
+    if message is None:
+        return Response({'error': 'Unknown job id.'}, status=status.HTTP_404_NOT_FOUND)
+    done = message.status in (OutboxMessage.STATUS_SENT, OutboxMessage.STATUS_FAILED)
+    return Response({
+        'job_id': job_id,
+        'status': message.status,
+        'done': done,
+        'attempts': message.attempts,
+        'sent_at': message.sent_at,
+        'next_attempt_at': None if done else message.next_attempt_at,
+    })
 
 
 class DownloadSigner(TimestampSigner):
@@ -72,70 +207,43 @@ def biodata_download_view(request, pk, token):
 def biodata_pdf_view(request, pk):
     """Generate PDF for an approved biodata.
 
-    This view tries to use WeasyPrint to render the biodata HTML into a PDF
-    and return it with Content-Disposition: attachment so the browser downloads
-    it directly. If WeasyPrint isn't installed, return 501 so the frontend can
-    fall back to the HTML-based flow.
+    The PDF is produced by the renderer backend configured for the biodata's
+    template (see ``biodata.rendering``), stored in the PDF cache and streamed
+    from there with Content-Disposition: attachment so the browser downloads
+    it directly. Responses carry a strong ETag (sha256 of the stored
+    artifact) and Last-Modified (the later of ``updated_at`` and the
+    artifact's render time); revalidations get 304 and byte ranges (resumed downloads)
+    get 206. If no configured backend is installed, return 501 so the
+    frontend can fall back to the HTML-based flow.
     """
     biodata = get_object_or_404(Biodata, pk=pk)
     if not biodata.is_approved:
         return HttpResponseForbidden("Biodata not approved yet")
 
-
-    # Determine border image path (match frontend logic)
-    border_map = {
-        '1': '/assets/border/White.png',
-        '2': '/assets/border/bg0.png',
-        '3': '/assets/border/bg3.jpg',
-        '4': '/assets/border/bg8.jpg',
-        '5': '/assets/border/bg9.jpg',
-    }
-    border_image_path = border_map.get(str(biodata.template_choice or '1'), '/assets/border/White.png')
-
-    # Profile image path (if present)
-    profile_image_path = biodata.profile_image.url if biodata.profile_image else None
-
-    # Split fields into two columns for each section (like frontend)
-    def split_dict(d):
-        if not d:
-            return [], []
-        items = list(d.items())
-        mid = (len(items) + 1) // 2
-        return items[:mid], items[mid:]
-
-    personal_left, personal_right = split_dict(biodata.data.get('PersonalDetails', {}))
-    family_left, family_right = split_dict(biodata.data.get('FamilyDetails', {}))
-    habits_left, habits_right = split_dict(biodata.data.get('HabitsDeclaration', {}))
-
-    context = {
-        "biodata": biodata,
-        "border_image_path": border_image_path,
-        "profile_image_path": profile_image_path,
-        "personal_left": personal_left,
-        "personal_right": personal_right,
-        "family_left": family_left,
-        "family_right": family_right,
-        "habits_left": habits_left,
-        "habits_right": habits_right,
-    }
+    # Validators come from the stored artifact, so revalidation opens the
+    # cache entry (cheap; digests are memoized) and only renders on a miss
     try:
-        html = render_to_string("biodata_download.html", context)
-    except Exception as e:
-        return HttpResponseServerError(f"Error rendering template: {e}")
-
-    try:
-        # Import WeasyPrint lazily; if not installed we signal backend doesn't support PDF
-        from weasyprint import HTML
-
-        pdf = HTML(string=html, base_url=request.build_absolute_uri('/')).write_pdf()
-        response = HttpResponse(pdf, content_type='application/pdf')
-        response['Content-Disposition'] = f'attachment; filename="biodata_{biodata.pk}.pdf"'
-        return response
-    except ImportError:
+        pdf_file, etag, _cache_hit = open_biodata_pdf(biodata)
+    except RendererUnavailable:
         return HttpResponse("PDF generation not available on server.", status=501)
     except Exception as e:
         return HttpResponseServerError(f"PDF generation failed: {e}")
 
+    # Template version or border changes produce a new artifact, so its
+    # mtime covers what updated_at alone would miss
+    times = [t for t in (artifact_mtime(pdf_file), biodata.updated_at and int(biodata.updated_at.timestamp()))
+             if t is not None]
+    last_modified = max(times) if times else None
+    if is_not_modified(request, [etag], last_modified):
+        pdf_file.close()
+        return not_modified_response(etag, last_modified)
+
+    response = ranged_file_response(request, pdf_file, 'application/pdf', etag=etag, last_modified=last_modified)
+    response['Content-Disposition'] = f'attachment; filename="biodata_{biodata.pk}.pdf"'
+    # The record can change, so clients must revalidate (cheap thanks to the ETag)
+    response['Cache-Control'] = 'private, no-cache'
+    return response
+
 
 def biodata_html_view(request, pk):
     """Render the biodata download HTML page (no token). This is a friendly
@@ -149,8 +257,62 @@ def biodata_html_view(request, pk):
 
 
 class BiodataViewSet(viewsets.ModelViewSet):
-    queryset = Biodata.objects.all().order_by('-created_at')
+    """Biodata CRUD API.
+
+    The list is cursor-paginated newest first (``?cursor=``, ``?page_size=``).
+    ``?fields=id,title,...`` on GET requests limits both the columns loaded
+    from the database and the serialized fields. Lists can be filtered with
+    ``name`` (prefix), ``city``, ``education``, ``occupation``,
+    ``age_min``/``age_max`` and ``height_min``/``height_max`` (inches),
+    all served by indexed columns (see ``biodata.profile_fields``).
+    ``?q=`` runs a full-text search over every field and pages by rank.
+    """
+    queryset = Biodata.objects.all().order_by('-created_at', '-id')
     serializer_class = BiodataSerializer
+    pagination_class = BiodataCursorPagination
+
+    def requested_fields(self):
+        if self.request.method != 'GET':
+            return []
+        known = BiodataSerializer.Meta.fields
+        return [name for name in parse_fields_param(self.request.query_params.get('fields')) if name in known]
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action == 'list':
+            try:
+                queryset = apply_profile_filters(queryset, self.request.query_params)
+            except ValueError as exc:
+                raise ValidationError({'detail': str(exc)})
+            query = self.request.query_params.get('q', '').strip()
+            if query:
+                queryset = self.search(queryset, query)
+        fields = self.requested_fields()
+        if fields:
+            columns = {'id', 'created_at'}  # the cursor orders on these
+            concrete = {f.name for f in Biodata._meta.concrete_fields}
+            for name in fields:
+                columns.update(c for c in SOURCE_FIELDS.get(name, (name,)) if c in concrete)
+            queryset = queryset.only(*columns)
+        return queryset
+
+    def search(self, queryset, query):
+        if search.is_available():
+            ids = search.search_ids(query, limit=getattr(settings, 'SEARCH_MAX_RESULTS', 500))
+            return search.ranked(queryset, ids)
+        from django.db.models import Q
+        return queryset.filter(Q(title__icontains=query) | Q(user_name__icontains=query) | Q(name__icontains=query))
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['fields'] = self.requested_fields()
+        return context
+
+    def create(self, request, *args, **kwargs):
+        response = super().create(request, *args, **kwargs)
+        # Lets the creator call owner-only endpoints (email_biodata_pdf_view)
+        response.data['owner_token'] = BiodataOwnerSigner().sign(str(response.data['id']))
+        return response
 
 
 @api_view(['POST'])
@@ -182,13 +344,13 @@ def payment_verify_view(request):
 
     if not biodata and getattr(request, 'user', None) and request.user.is_authenticated:
         try:
-            biodata = Biodata.objects.filter(user_email__iexact=request.user.email).order_by('-created_at').first()
+            biodata = Biodata.objects.for_email(request.user.email).order_by('-created_at').first()
         except Exception:
             biodata = None
 
     if not biodata:
         # Fallback: attach to latest pending/most-recent biodata without a screenshot
-        biodata = Biodata.objects.filter(payment_screenshot__isnull=True).order_by('-created_at').first()
+        biodata = Biodata.objects.without_payment_screenshot().order_by('-created_at').first()
 
     if not biodata:
         return Response({'error': 'Could not find a Biodata record to attach the screenshot to. Provide biodata_id or ensure you are authenticated.'}, status=status.HTTP_400_BAD_REQUEST)
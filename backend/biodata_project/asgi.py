@@ -3,3 +3,8 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'biodata_project.settings')
 application = get_asgi_application()
+
+# Encode the PDF border images off the request path (see biodata.assets)
+from biodata.assets import start_border_prewarm  # noqa: E402
+
+start_border_prewarm()
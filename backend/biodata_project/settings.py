@@ -74,6 +74,24 @@ if not EMAIL_HOST_PASSWORD and EMAIL_BACKEND == 'django.core.mail.backends.smtp.
     )
 
 DEFAULT_FROM_EMAIL = os.environ.get('DEFAULT_FROM_EMAIL', EMAIL_HOST_USER or 'noreply@yourdomain.com')
+# Retries of transient SMTP failures on a reused connection (biodata/mail.py);
+# waits EMAIL_RETRY_BACKOFF seconds, doubling each attempt
+EMAIL_SEND_RETRIES = 3
+EMAIL_RETRY_BACKOFF = 1.0
+
+# Email outbox (biodata/outbox.py, delivered by `manage.py deliver_outbox`).
+# Gmail throttles bursts, so sending is capped per minute across workers;
+# failed messages are retried OUTBOX_MAX_ATTEMPTS times with exponential
+# backoff starting at OUTBOX_RETRY_BACKOFF seconds.
+OUTBOX_DIR = BASE_DIR / 'outbox'
+OUTBOX_RATE_LIMIT_PER_MINUTE = int(os.environ.get('OUTBOX_RATE_LIMIT_PER_MINUTE', 20))
+OUTBOX_MAX_ATTEMPTS = 5
+OUTBOX_RETRY_BACKOFF = 60
+OUTBOX_DEDUPE_WINDOW = 60 * 60  # seconds
+# Largest PDF accepted by /api/upload_pdf_and_send_email/ (spooled to disk)
+EMAIL_UPLOAD_MAX_BYTES = int(os.environ.get('EMAIL_UPLOAD_MAX_BYTES', 10 * 1024 * 1024))
+# Server-rendered PDF emails (/api/biodata/<id>/email/) allowed per record per hour
+BIODATA_EMAIL_PER_HOUR = 3
 
 SECRET_KEY = 'CHANGE_ME_TO_A_SECURE_RANDOM_KEY'
 DEBUG = True
@@ -140,6 +158,18 @@ DATABASES = {
     }
 }
 
+# Opt-in SQLite profile for concurrent form submissions/uploads (see
+# biodata/sqlite.py): SQLITE_CONCURRENT_WRITES=true applies these PRAGMAs to
+# every connection. `python manage.py bench_sqlite_writes` compares the two.
+SQLITE_CONCURRENT_WRITES = os.environ.get('SQLITE_CONCURRENT_WRITES', 'False').lower() == 'true'
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'busy_timeout': 5000,
+    'synchronous': 'NORMAL',
+    'mmap_size': 128 * 1024 * 1024,
+    'cache_size': -16000,  # KiB
+}
+
 AUTH_PASSWORD_VALIDATORS = []
 
 LANGUAGE_CODE = 'en-us'
@@ -152,14 +182,20 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
-# During development, serve the frontend's css/js/assets via Django staticfiles
-# without changing the existing HTML paths.
-# Note: Comment out STATICFILES_DIRS when running collectstatic to avoid conflicts
+# The frontend's css/js/assets are collected under matching prefixes
+# (/static/css/..., /static/js/..., /static/assets/...). In production run
+# `python manage.py collectstatic`: files get content-hashed names, .gz/.br
+# siblings and a staticfiles.json manifest, and the frontend HTML served by
+# serve_static_html is rewritten to the hashed URLs (cached for a year).
 STATICFILES_DIRS = [
-    BASE_DIR.parent / 'css',
-    BASE_DIR.parent / 'js',
-    BASE_DIR.parent / 'assets',
+    ('css', BASE_DIR.parent / 'css'),
+    ('js', BASE_DIR.parent / 'js'),
+    ('assets', BASE_DIR.parent / 'assets'),
 ]
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'biodata_project.storage.CompressedManifestStaticFilesStorage'},
+}
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
@@ -176,3 +212,62 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.AllowAny',
     ]
 }
+
+# Default page size of the cursor-paginated /api/biodata/ list (?page_size=, max 100)
+BIODATA_PAGE_SIZE = 20
+# Upper bound on full-text search hits (admin search box and ?q= on the API)
+SEARCH_MAX_RESULTS = 500
+# How long the admin changelist reuses a COUNT(*) (biodata.pagination.CachedCountPaginator)
+ADMIN_COUNT_CACHE_SECONDS = 30
+# Rows the admin counts exactly; larger result sets use an estimate instead
+ADMIN_COUNT_LIMIT = 10000
+
+# Warm headless Chromium pool used for PDF rendering (see biodata/browser_pool.py).
+# SIZE browsers are kept running per process and recycled after
+# MAX_RENDERS_PER_BROWSER renders; idle browsers are health-checked every
+# HEALTH_CHECK_INTERVAL seconds.
+PDF_BROWSER_POOL = {
+    'SIZE': int(os.environ.get('PDF_BROWSER_POOL_SIZE', 2)),
+    'MAX_RENDERS_PER_BROWSER': int(os.environ.get('PDF_BROWSER_MAX_RENDERS', 200)),
+    'HEALTH_CHECK_INTERVAL': 60,
+    'TIMEOUT': 120,
+}
+
+# 'inline' loads the HTML in memory and waits for fonts/images to be ready
+# (at most PDF_READY_TIMEOUT_MS); 'file' is the legacy temp-file + 1s sleep.
+PDF_RENDER_MODE = os.environ.get('PDF_RENDER_MODE', 'inline')
+PDF_READY_TIMEOUT_MS = 5000
+
+# Rendered PDFs are cached on disk by a fingerprint of the biodata (see
+# biodata/pdf_cache.py). Bump PDF_TEMPLATE_VERSION whenever template HTML/CSS
+# changes so stale PDFs are not served.
+PDF_CACHE_DIR = BASE_DIR / 'pdf_cache'
+PDF_CACHE_MAX_BYTES = int(os.environ.get('PDF_CACHE_MAX_BYTES', 512 * 1024 * 1024))
+PDF_TEMPLATE_VERSION = '2'
+
+# Background PDF render + email jobs (python manage.py render_worker)
+RENDER_JOB_MAX_ATTEMPTS = 3
+# Seconds before a failed job is retried, doubling per attempt
+RENDER_JOB_RETRY_BACKOFF = 30
+
+# Render processes per worker (0 = auto from CPU count and available memory)
+RENDER_CONCURRENCY = int(os.environ.get('RENDER_CONCURRENCY', 1))
+RENDER_WORKER_MEMORY_MB = 400
+
+# PDF renderer backend per template_choice ("default" for the rest). Values are
+# backend names (playwright, weasyprint, xhtml2pdf), dotted paths to a
+# biodata.rendering.BaseRenderer subclass, or a list tried in order.
+PDF_RENDERERS = {
+    'default': ['playwright', 'weasyprint'],
+}
+
+# In-process cache of base64 data URIs for border/profile images (biodata/assets.py)
+DATA_URI_CACHE_MAX_BYTES = 64 * 1024 * 1024
+# Encode all borders in the background when the web server or render worker starts
+PDF_PREWARM_BORDERS = True
+
+# Output of manage.py optimize_borders (print-resolution borders + manifest.json)
+BORDER_PRINT_DIR = BASE_DIR.parent / 'assets' / 'border' / 'print'
+
+# serve_static_html re-checks page mtimes at most this often (seconds)
+STATIC_HTML_RECHECK_SECONDS = 0 if DEBUG else 2
@@ -0,0 +1,58 @@
+"""Static files storage used by ``collectstatic`` for production.
+
+On top of Django's ManifestStaticFilesStorage (content-hashed filenames plus
+``staticfiles.json`` manifest) every hashed text asset also gets ``.gz`` and,
+when the ``brotli`` package is installed, ``.br`` siblings so the server
+never compresses static files per request.
+"""
+import gzip
+import logging
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+
+logger = logging.getLogger(__name__)
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    # Unknown names fall back to the plain URL instead of raising
+    manifest_strict = False
+    compress_extensions = ('.css', '.js', '.svg', '.html', '.json', '.txt', '.map', '.xml')
+    # Keep a compressed sibling only if it saves at least this fraction
+    min_saving = 0.05
+
+    def url_converter(self, name, hashed_files, template=None):
+        convert = super().url_converter(name, hashed_files, template)
+
+        def converter(matchobj):
+            try:
+                return convert(matchobj)
+            except ValueError:
+                # Referenced file isn't shipped (e.g. html2pdf's source map); leave it untouched
+                logger.warning("collectstatic: %s references a missing file: %s", name, matchobj.group('url'))
+                return matchobj.group('matched')
+        return converter
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run=dry_run, **options)
+        if dry_run:
+            return
+        for hashed_name in set(self.hashed_files.values()):
+            if hashed_name.endswith(self.compress_extensions):
+                self._write_compressed_siblings(hashed_name)
+
+    def _write_compressed_siblings(self, name):
+        with self.open(name) as f:
+            content = f.read()
+        variants = {'.gz': gzip.compress(content, compresslevel=9, mtime=0)}
+        try:
+            import brotli
+            variants['.br'] = brotli.compress(content, quality=11)
+        except ImportError:
+            pass
+        for suffix, compressed in variants.items():
+            target = name + suffix
+            if self.exists(target):
+                self.delete(target)
+            if len(compressed) <= len(content) * (1 - self.min_saving):
+                self._save(target, ContentFile(compressed))
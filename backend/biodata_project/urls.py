@@ -1,10 +1,10 @@
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, re_path, include
 from django.conf import settings
 from django.conf.urls.static import static
 from django.views.generic import TemplateView
 from pathlib import Path
-from .views import serve_static_html
+from .views import serve_static_asset, serve_static_html
 
 urlpatterns = [
     path('grappelli/', include('grappelli.urls')),  # grappelli URLS
@@ -27,3 +27,6 @@ if settings.DEBUG:
     urlpatterns += static('/css/', document_root=FRONTEND_ROOT / 'css')
     urlpatterns += static('/js/', document_root=FRONTEND_ROOT / 'js')
     urlpatterns += static('/assets/', document_root=FRONTEND_ROOT / 'assets')
+else:
+    # Hashed, precompressed files produced by collectstatic (see biodata_project/storage.py)
+    urlpatterns += [re_path(r'^static/(?P<path>.*)$', serve_static_asset, name='static-asset')]
@@ -1,22 +1,166 @@
-from django.http import HttpResponse
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils._os import safe_join
+from django.utils.http import http_date
 from django.conf import settings
 from pathlib import Path
+import gzip
+import hashlib
+import mimetypes
 import os
+import re
+import threading
+import time
+
+from biodata.http import is_not_modified, not_modified_response
+
+
+# css/js/assets references in the frontend HTML
+STATIC_REF_RE = re.compile(r'\b(?P<attr>src|href)="(?P<path>(?:css|js|assets)/[^"#?]+)"')
+# Django's ManifestStaticFilesStorage names: name.<12 hex chars>.ext
+HASHED_NAME_RE = re.compile(r'\.[0-9a-f]{12}\.[^./]+$')
+FAR_FUTURE = 'public, max-age=31536000, immutable'
+
+
+def rewrite_static_refs(html):
+    """Point css/js/assets references at their content-hashed /static/ URLs.
+
+    Only done outside DEBUG and for files present in the collectstatic
+    manifest; anything else keeps its original relative path.
+    """
+    if settings.DEBUG:
+        return html
+    from django.contrib.staticfiles.storage import staticfiles_storage
+    hashed_files = getattr(staticfiles_storage, 'hashed_files', None)
+    if not hashed_files:
+        return html
+
+    def replace(match):
+        path = match.group('path')
+        if path not in hashed_files:
+            return match.group(0)
+        return f'{match.group("attr")}="{staticfiles_storage.url(path)}"'
+
+    return STATIC_REF_RE.sub(replace, html)
+
+
+class _CachedPage:
+    """One frontend HTML page with its precompressed variants."""
+
+    def __init__(self, path, st):
+        with open(path, 'r', encoding='utf-8') as file:
+            content = rewrite_static_refs(file.read()).encode('utf-8')
+        self.key = (st.st_mtime_ns, st.st_size)
+        self.last_modified = int(st.st_mtime)
+        digest = hashlib.sha256(content).hexdigest()[:20]
+        self.variants = {'identity': content}
+        self.variants['gzip'] = gzip.compress(content, compresslevel=9, mtime=0)
+        try:
+            import brotli
+            self.variants['br'] = brotli.compress(content, mode=brotli.MODE_TEXT, quality=11)
+        except ImportError:
+            pass
+        # Strong ETags must differ per content-coding
+        self.etags = {encoding: f'"{digest}-{encoding}"' for encoding in self.variants}
+        self.checked_at = time.monotonic()
+
+
+_pages = {}
+_pages_lock = threading.Lock()
+
+
+def _get_page(path):
+    """Return the cached page for ``path`` (re-read when its mtime/size change)."""
+    page = _pages.get(path)
+    recheck = getattr(settings, 'STATIC_HTML_RECHECK_SECONDS', 2)
+    if page is not None and time.monotonic() - page.checked_at < recheck:
+        return page
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    if page is not None and page.key == (st.st_mtime_ns, st.st_size):
+        page.checked_at = time.monotonic()
+        return page
+    page = _CachedPage(path, st)
+    with _pages_lock:
+        _pages[path] = page
+    return page
+
+
+def _accepted_encodings(request):
+    accepted = set()
+    for part in request.META.get('HTTP_ACCEPT_ENCODING', '').split(','):
+        coding, _, params = part.strip().partition(';')
+        params = params.replace(' ', '')
+        if coding and params not in ('q=0', 'q=0.0', 'q=0.00', 'q=0.000'):
+            accepted.add(coding.lower())
+    return accepted
+
 
 def serve_static_html(request, template_name):
     """
-    Serve static HTML files without Django template processing
+    Serve static HTML files without Django template processing.
+
+    Pages are held in memory (re-read when the file's mtime changes) together
+    with gzip and, when the ``brotli`` package is installed, brotli variants
+    compressed once. Responses carry ETag/Last-Modified and revalidations get
+    304, so page views do no file reads or compression.
     """
     # Construct the path to the HTML file
     frontend_root = Path(settings.BASE_DIR).parent
-    html_file_path = frontend_root / template_name
-    
-    # Check if file exists
-    if not html_file_path.exists():
+    html_file_path = str(frontend_root / template_name)
+
+    page = _get_page(html_file_path)
+    if page is None:
         return HttpResponse("File not found", status=404)
-    
-    # Read and return the file content as-is
-    with open(html_file_path, 'r', encoding='utf-8') as file:
-        content = file.read()
-    
-    return HttpResponse(content, content_type='text/html')
\ No newline at end of file
+
+    accepted = _accepted_encodings(request)
+    if 'br' in accepted and 'br' in page.variants:
+        encoding = 'br'
+    elif 'gzip' in accepted:
+        encoding = 'gzip'
+    else:
+        encoding = 'identity'
+
+    if is_not_modified(request, list(page.etags.values()), page.last_modified):
+        response = not_modified_response(page.etags[encoding], page.last_modified)
+    else:
+        response = HttpResponse(page.variants[encoding], content_type='text/html; charset=utf-8')
+        if encoding != 'identity':
+            response['Content-Encoding'] = encoding
+        response['ETag'] = page.etags[encoding]
+        response['Last-Modified'] = http_date(page.last_modified)
+    response['Vary'] = 'Accept-Encoding'
+    # Let browsers keep the page but revalidate it (cheap 304) on every view
+    response['Cache-Control'] = 'no-cache'
+    return response
+
+
+def serve_static_asset(request, path):
+    """Serve collected static files from STATIC_ROOT (used when DEBUG is off).
+
+    Content-hashed files are cached by browsers for a year; precompressed
+    ``.br``/``.gz`` siblings written by collectstatic are sent when accepted.
+    """
+    try:
+        full_path = safe_join(str(settings.STATIC_ROOT), path)
+    except Exception:
+        raise Http404("Invalid path")
+    if not os.path.isfile(full_path):
+        raise Http404("File not found")
+
+    accepted = _accepted_encodings(request)
+    chosen, encoding = full_path, None
+    for coding, suffix in (('br', '.br'), ('gzip', '.gz')):
+        if coding in accepted and os.path.isfile(full_path + suffix):
+            chosen, encoding = full_path + suffix, coding
+            break
+
+    content_type, _ = mimetypes.guess_type(full_path)
+    response = FileResponse(open(chosen, 'rb'), content_type=content_type or 'application/octet-stream')
+    if encoding:
+        response['Content-Encoding'] = encoding
+    response['Vary'] = 'Accept-Encoding'
+    response['Last-Modified'] = http_date(os.stat(full_path).st_mtime)
+    response['Cache-Control'] = FAR_FUTURE if HASHED_NAME_RE.search(path) else 'no-cache'
+    return response
@@ -110,7 +110,9 @@ class APIClient {
             if (text) message = text;
           } catch (_) {}
         }
-        throw new Error(message);
+        const httpError = new Error(message);
+        httpError.status = response.status;
+        throw httpError;
       }
 
       return await response.json();
@@ -214,7 +216,12 @@ class APIClient {
     return this.post("/api/biodata/", formData);
   }
 
-  async getBiodataList() {
+  // Cursor-paginated: pass the previous response's `next` URL for the next page
+  async getBiodataList(nextUrl = null) {
+    if (nextUrl) {
+      const next = new URL(nextUrl, this.baseURL);
+      return this.get(next.pathname + next.search);
+    }
     return this.get("/api/biodata/");
   }
 
@@ -231,6 +238,32 @@ class APIClient {
     }
     return this.post("/api/payment/verify/", formData);
   }
+
+  // Email endpoints: the server queues the email and answers 202 with a
+  // status_url to poll until `done`
+  async uploadPdfForEmail(pdfBlob, email) {
+    const formData = new FormData();
+    formData.append("pdf", pdfBlob, "biodata.pdf");
+    formData.append("email", email);
+    return this.post("/api/upload_pdf_and_send_email/", formData, {
+      includeAuth: false,
+    });
+  }
+
+  // Email an approved biodata's PDF, rendered on the server. ownerToken is
+  // the `owner_token` returned by createBiodata.
+  async emailBiodataPdf(biodataId, ownerToken) {
+    return this.post(
+      `/api/biodata/${biodataId}/email/`,
+      { owner_token: ownerToken },
+      { includeAuth: false }
+    );
+  }
+
+  async getEmailStatus(statusUrl) {
+    const url = new URL(statusUrl, this.baseURL);
+    return this.get(url.pathname + url.search, { includeAuth: false });
+  }
 }
 
 // Export singleton instance
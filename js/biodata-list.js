@@ -1,5 +1,8 @@
 // Biodata List JavaScript
 
+// Cursor of the next page (the API returns one page at a time)
+let nextPageUrl = null;
+
 async function loadBiodataList() {
   const loading = document.getElementById("loading");
   const error = document.getElementById("error");
@@ -10,6 +13,7 @@ async function loadBiodataList() {
     const data = await api.getBiodataList();
 
     const biodataList = data.results || data;
+    nextPageUrl = data.next || null;
 
     loading.classList.add("hidden");
 
@@ -18,6 +22,7 @@ async function loadBiodataList() {
     } else {
       container.classList.remove("hidden");
       renderBiodataList(biodataList);
+      updateLoadMoreButton();
     }
   } catch (err) {
     loading.classList.add("hidden");
@@ -26,6 +31,38 @@ async function loadBiodataList() {
   }
 }
 
+async function loadNextPage() {
+  const button = document.getElementById("load-more");
+  if (!nextPageUrl) return;
+  button.disabled = true;
+  button.textContent = "Loading...";
+  try {
+    const data = await api.getBiodataList(nextPageUrl);
+    nextPageUrl = data.next || null;
+    renderBiodataList(data.results || []);
+  } catch (err) {
+    const error = document.getElementById("error");
+    error.classList.remove("hidden");
+    error.textContent = "Error: " + err.message;
+  }
+  updateLoadMoreButton();
+}
+
+function updateLoadMoreButton() {
+  const container = document.getElementById("biodata-container");
+  let button = document.getElementById("load-more");
+  if (!button) {
+    button = document.createElement("button");
+    button.id = "load-more";
+    button.className = "mt-2 px-4 py-2 rounded-md bg-gray-800 text-white text-sm";
+    button.addEventListener("click", loadNextPage);
+    container.after(button);
+  }
+  button.disabled = false;
+  button.textContent = "Load more";
+  button.classList.toggle("hidden", !nextPageUrl);
+}
+
 function renderBiodataList(list) {
   const container = document.getElementById("biodata-container");
 
@@ -41,9 +78,10 @@ function renderBiodataList(list) {
                     ? `
                     <div class="flex-shrink-0">
                         <img 
-                            src="http://127.0.0.1:8000${item.profile_image}" 
+                            src="http://127.0.0.1:8000${item.profile_thumbnail || item.profile_image}" 
                             alt="${item.name}" 
                             class="w-24 h-24 object-cover rounded-md"
+                            loading="lazy"
                         >
                     </div>
                 `
@@ -409,11 +409,9 @@ async function submitRegistration(event) {
       downloadBtn.textContent = "Awaiting Approval";
     }
 
-    // Automatically generate and send PDF after registration
+    // Have the server render and email the PDF of the saved record
     if (email) {
-      setTimeout(() => {
-        autoGenerateAndSendPDF(email);
-      }, 1000); // slight delay to ensure DOM updates
+      autoGenerateAndSendPDF(email, resp && resp.id, resp && resp.owner_token);
     }
   } catch (err) {
     console.error(err);
@@ -1015,8 +1013,31 @@ window.submitRegistration = submitRegistration;
 
 window.sendFreeTemplateToEmail = sendFreeTemplateToEmail;
 
-// Automatically generate and upload PDF after approval
-async function autoGenerateAndSendPDF(email) {
+// Email the biodata PDF after registration. The server renders it itself
+// (holding the email until the record is approved); only when it has no
+// renderer (501) is the preview PDF built here and uploaded instead.
+async function autoGenerateAndSendPDF(email, biodataId, ownerToken) {
+  if (biodataId && ownerToken) {
+    try {
+      const job = await api.emailBiodataPdf(biodataId, ownerToken);
+      if (job.status === "held") {
+        showEmailStatus(job.status);
+      } else {
+        pollEmailStatus(job.status_url);
+      }
+      return;
+    } catch (e) {
+      if (e.status !== 501) {
+        console.error("Could not send biodata PDF by email:", e);
+        return;
+      }
+    }
+  }
+  await uploadBrowserPdf(email);
+}
+
+// Fallback: render the PDF in the browser with html2pdf and upload it
+async function uploadBrowserPdf(email) {
   // Force re-render to ensure empty sections are hidden
   if (typeof renderTemplate === "function" && typeof selectedTemplate !== "undefined") {
     renderTemplate(selectedTemplate);
@@ -1030,17 +1051,45 @@ async function autoGenerateAndSendPDF(email) {
     html2canvas: { scale: 2, useCORS: true },
     jsPDF: { unit: "pt", format: "a4", orientation: "portrait" },
   };
-  // Generate PDF as Blob
-  const pdfBlob = await html2pdf().set(opt).from(element).outputPdf("blob");
-  // Prepare FormData
-  const formData = new FormData();
-  formData.append("pdf", pdfBlob, "biodata.pdf");
-  formData.append("email", email);
-  // Send to backend
-  fetch("/api/upload_pdf_and_send_email/", {
-    method: "POST",
-    body: formData,
-  });
+  try {
+    // Generate PDF as Blob
+    const pdfBlob = await html2pdf().set(opt).from(element).outputPdf("blob");
+    // The backend queues the email and answers right away
+    const job = await api.uploadPdfForEmail(pdfBlob, email);
+    pollEmailStatus(job.status_url);
+  } catch (e) {
+    console.error("Could not send biodata PDF by email:", e);
+  }
+}
+
+// Poll a queued email until it is sent or has failed, backing off to 30s
+async function pollEmailStatus(statusUrl, delay = 2000) {
+  const deadline = Date.now() + 10 * 60 * 1000;
+  while (Date.now() < deadline) {
+    await new Promise((resolve) => setTimeout(resolve, delay));
+    try {
+      const job = await api.getEmailStatus(statusUrl);
+      if (job.done) {
+        showEmailStatus(job.status);
+        return job;
+      }
+    } catch (e) {
+      console.warn("Could not check email status:", e);
+    }
+    delay = Math.min(delay * 2, 30000);
+  }
+  return null;
+}
+
+function showEmailStatus(status) {
+  const el = document.getElementById("email-status");
+  if (!el) return;
+  const messages = {
+    sent: "Your biodata PDF has been emailed to you.",
+    held: "Your biodata PDF will be emailed to you once it is approved.",
+  };
+  el.textContent = messages[status] || "We could not email your biodata PDF. Please contact support.";
+  el.classList.remove("hidden");
 }
 
 // Initialize